@@ -1,60 +1,160 @@
 # Python
 from __future__ import unicode_literals
+from collections import OrderedDict
+import contextlib
+import copy
+from datetime import timedelta
 import functools
+import hashlib
+from inspect import iscoroutinefunction
+import re
+import threading
+import time
+import uuid
+import warnings
 
 # Six
 import six
+from six.moves.urllib.parse import quote
 
 # Django
-from django.contrib.admin import helpers
+import django
+from django.apps import apps
+from django.conf import settings
+from django.contrib.admin import ModelAdmin, helpers
+from django.contrib.admin.models import CHANGE, LogEntry
 from django.contrib.admin.options import get_content_type_for_model
-from django.contrib.admin.utils import unquote
+from django.contrib.admin.utils import model_ngettext, unquote
 from django.contrib.admin.templatetags.admin_urls import add_preserved_filters
 from django.contrib.auth import get_permission_codename
 from django.contrib import messages
-from django.core.exceptions import PermissionDenied
-from django.db import router, transaction
+from django.core.cache import caches
+from django.core.exceptions import PermissionDenied, ValidationError
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, NotSupportedError, connections, router, transaction
+from django.db.models import BooleanField, Case, Value, When
 from django.forms.models import modelform_factory
 from django.http import HttpResponseRedirect
+from django.middleware.csrf import CsrfViewMiddleware
+from django.shortcuts import get_object_or_404
 from django.template.response import TemplateResponse
 from django.urls import reverse
-from django.utils.html import format_html, format_html_join
+from django.utils.cache import add_never_cache_headers
+from django.utils.encoding import force_str
+from django.utils.functional import Promise
+from django.utils.html import conditional_escape, format_html, format_html_join
+from django.utils.http import RFC3986_SUBDELIMS
 try:
     from django.utils.http import url_has_allowed_host_and_scheme
 except ImportError:
     from django.utils.http import is_safe_url as url_has_allowed_host_and_scheme
 from django.utils.safestring import mark_safe
-from django.utils.translation import gettext_lazy as _
+from django.utils.text import get_text_list
+from django.utils.translation import get_language, gettext_lazy as _
 try:
     from django.urls import re_path
 except ImportError:
     from django.conf.urls import url as re_path
 
+# ASGIRef
+try:
+    from asgiref.sync import sync_to_async
+except ImportError:
+    sync_to_async = None
+
 # Django-CRUM
-from crum import get_current_request
+try:
+    from crum import get_current_request
+except ImportError:
+    def get_current_request():
+        return None
 
 # Django-Admin-Object-Actions
-from .forms import AdminObjectActionForm
+from .cache import ObjectActionFragmentCache
+from .exceptions import ObjectActionLocked, ObjectActionQueryBudgetExceeded, ObjectActionQueryBudgetWarning
+from .executors import get_object_action_executor
+from .forms import AdminObjectActionForm, AdminObjectActionStepsForm
+from .metrics import (
+    PHASE_DESCRIPTIONS, ObjectActionPhaseTimer, ObjectActionQueryCounter, get_object_action_metrics, null_phase,
+)
+from .models import ObjectActionLog, ObjectActionTask
+
+# Placeholder reversed in place of an object ID to build action URL templates.
+OBJECT_ID_PLACEHOLDER = '__object_action_object_id__'
+
+# Request parameter carrying the idempotency token of an action submission.
+OBJECT_ACTION_TOKEN_PARAM = '_object_action_token'
+
+# Idempotency cache value of submissions which have not completed yet.
+OBJECT_ACTION_TOKEN_PENDING = 'pending'
+
+object_action_form_cache_lock = threading.Lock()
 
 
 class ModelAdminObjectActionsMixin(object):
 
     object_actions = []
     object_action_form_class = AdminObjectActionForm
+    object_action_steps_form_class = AdminObjectActionStepsForm
+    object_action_form_cache_size = 128
+    object_action_form_cache_warm = False
+    object_action_url_dispatcher = False
+    object_action_bulk_chunk_size = 100
+    object_action_executor = 'admin_object_actions.executors.ThreadObjectActionExecutor'
+    object_action_history = False
+    object_action_history_limit = 100
+    object_action_metrics = None
+    object_action_server_timing = False
+    object_action_query_budgets = None
+    object_action_query_budget_mode = 'raise'
+    object_action_column_max_queries = None
+    object_action_fragment_cache = None
+    object_action_fragment_cache_size = 10000
+    object_action_fragment_cache_timeout = 300
+    object_action_idempotency = False
+    object_action_idempotency_cache = 'default'
+    object_action_idempotency_timeout = 3600
+    object_action_idempotency_wait = 10
 
-    def get_object_actions(self, obj=None):
-        object_actions = []
-        for object_action in self.object_actions:
+    def compile_object_actions(self, object_actions):
+        compiled_object_actions = OrderedDict()
+        for object_action in object_actions:
             assert isinstance(object_action, dict)
-            assert object_action.get('slug')
-            object_actions.append(object_action)
-        return object_actions
+            slug = object_action.get('slug')
+            assert slug
+            assert slug not in compiled_object_actions, 'duplicate object action: {}'.format(slug)
+            compiled_object_actions[slug] = object_action
+        for slug, object_action in compiled_object_actions.items():
+            for step in object_action.get('steps') or ():
+                step_action = compiled_object_actions.get(step, None)
+                assert step_action is not None, 'unknown step of object action {}: {}'.format(slug, step)
+                assert not step_action.get('steps') and not step_action.get('view'), 'invalid step of object action {}: {}'.format(slug, step)
+        return compiled_object_actions
 
-    def get_object_action_option(self, action, option, default=None):
+    def get_object_actions_index(self):
+        # Compiled once per ModelAdmin instance; recompiled only if the
+        # object_actions attribute is replaced.
+        cached = self.__dict__.get('_object_actions_index', None)
+        if cached is None or cached[0] is not self.object_actions:
+            cached = (self.object_actions, self.compile_object_actions(self.object_actions))
+            self.__dict__['_object_actions_index'] = cached
+        return cached[1]
+
+    def get_object_actions(self, obj=None):
+        return list(self.get_object_actions_index().values())
+
+    def get_object_action_spec(self, action):
+        object_action = self.get_object_actions_index().get(action, None)
+        if object_action is not None:
+            return object_action
+        # Fall back to a scan for actions only returned by an overridden
+        # get_object_actions().
         for object_action in self.get_object_actions():
-            if action == object_action['slug'] and option in object_action:
-                return object_action[option]
-        return default
+            if action == object_action['slug']:
+                return object_action
+        return None
+
+    def get_object_action_option(self, action, option, default=None):
+        return (self.get_object_action_spec(action) or {}).get(option, default)
 
     def get_object_action_view_name(self, action):
         opts = self.model._meta
@@ -63,35 +163,119 @@ class ModelAdminObjectActionsMixin(object):
     def get_object_action_verbose_name(self, request, obj, action):
         return self.get_object_action_option(action, 'verbose_name', action.title())
 
+    def get_object_action_verbose_name_past(self, request, obj, action):
+        verbose_name_past = self.get_object_action_option(action, 'verbose_name_past', None)
+        steps = self.get_object_action_option(action, 'steps', None)
+        if verbose_name_past is None and steps:
+            verbose_name_past = get_text_list([
+                self.get_object_action_verbose_name_past(request, obj, step) or self.get_object_action_verbose_name(request, obj, step)
+                for step in steps
+            ], _('and'))
+        return verbose_name_past
+
     def get_object_action_verbose_name_title(self, request, obj, action):
         return self.get_object_action_option(action, 'verbose_name_title', self.get_object_action_verbose_name(request, obj, action))
 
+    def get_object_action_form_class(self, action, fields, readonly_fields=()):
+        cache_key = (self.model, action, self.object_action_form_class, tuple(fields), tuple(readonly_fields))
+        form_cache = self.__dict__.setdefault('_object_action_form_cache', OrderedDict())
+        with object_action_form_cache_lock:
+            form_class = form_cache.get(cache_key, None)
+            if form_class is not None:
+                form_cache.move_to_end(cache_key)
+                return form_class
+        form_class = modelform_factory(self.model, form=self.object_action_form_class, fields=tuple(fields), exclude=None)
+        with object_action_form_cache_lock:
+            form_cache[cache_key] = form_class
+            while len(form_cache) > self.object_action_form_cache_size:
+                form_cache.popitem(last=False)
+        return form_class
+
+    def get_object_action_steps_form_class(self, request, obj, action):
+        steps = self.get_object_action_option(action, 'steps')
+        step_form_classes = tuple(self.get_object_action_form(request, obj, step) for step in steps)
+        readonly_fields = tuple(self.get_object_action_readonly_fields(request, obj, action))
+        cache_key = (self.model, action, self.object_action_steps_form_class, step_form_classes, readonly_fields)
+        form_cache = self.__dict__.setdefault('_object_action_form_cache', OrderedDict())
+        with object_action_form_cache_lock:
+            form_class = form_cache.get(cache_key, None)
+            if form_class is not None:
+                form_cache.move_to_end(cache_key)
+                return form_class
+        base_fields = OrderedDict()
+        for step_form_class in step_form_classes:
+            for name, field in step_form_class.base_fields.items():
+                if name not in readonly_fields:
+                    base_fields.setdefault(name, field)
+        # Model fields are listed in Meta, so that their initial values are
+        # taken from the instance and the formfield callback is applied.
+        model_fields = set(f.name for f in self.model._meta.get_fields())
+        fields = tuple(name for name in base_fields if name in model_fields)
+        meta = type(str('Meta'), (object,), {'model': self.model, 'fields': fields})
+        form_class = type(str('{}StepsForm'.format(self.model.__name__)), (self.object_action_steps_form_class,), {'Meta': meta})
+        form_class.base_fields = base_fields
+        with object_action_form_cache_lock:
+            form_cache[cache_key] = form_class
+            while len(form_cache) > self.object_action_form_cache_size:
+                form_cache.popitem(last=False)
+        return form_class
+
+    def warm_object_action_form_cache(self):
+        for object_action in self.get_object_actions():
+            if object_action.get('form_class') is not None or object_action.get('steps'):
+                continue
+            readonly_fields = object_action.get('readonly_fields') or ()
+            fields = tuple(f for f in object_action.get('fields') or () if f not in readonly_fields)
+            self.get_object_action_form_class(object_action['slug'], fields, readonly_fields)
+
     def get_object_action_form(self, request, obj, action):
         form_class = self.get_object_action_option(action, 'form_class')
         if form_class is not None:
             return form_class
+        if self.get_object_action_option(action, 'steps'):
+            return self.get_object_action_steps_form_class(request, obj, action)
         fields = self.get_object_action_option(action, 'fields') or ()
         readonly_fields = self.get_object_action_readonly_fields(request, obj, action)
         fields = tuple(f for f in fields if f not in readonly_fields)
-        defaults = {
-            'form': self.object_action_form_class,
-            'fields': fields,
-            'exclude': None,
+        return self.get_object_action_form_class(action, fields, readonly_fields)
+
+    def get_object_action_form_kwargs(self, request, obj, action):
+        if self.get_object_action_option(action, 'form_class') is not None:
+            return {}
+        steps = self.get_object_action_option(action, 'steps')
+        if steps:
+            return {
+                'formfield_callback': functools.partial(self.formfield_for_dbfield, request=request),
+                'object_action_steps': [
+                    (step, self.get_object_action_form(request, obj, step), self.get_object_action_form_kwargs(request, obj, step))
+                    for step in steps
+                ],
+            }
+        form_kwargs = {
             'formfield_callback': functools.partial(self.formfield_for_dbfield, request=request),
         }
-        form_class = modelform_factory(self.model, **defaults)
         callable_function = self.get_object_action_option(action, 'function', None)
         if callable_function:
             if isinstance(callable_function, six.string_types):
                 callable_function = getattr(self, callable_function, getattr(obj, callable_function, None))
                 assert callable_function
-            setattr(form_class, 'do_object_action_callable', callable_function)
-        return form_class
+            form_kwargs['do_object_action_callable'] = callable_function
+        return form_kwargs
 
     def get_object_action_readonly_fields(self, request, obj, action):
         readonly_fields = self.get_object_action_option(action, 'readonly_fields')
         if readonly_fields is not None:
             return readonly_fields
+        steps = self.get_object_action_option(action, 'steps')
+        if steps:
+            # Fields editable in any step are not read-only for the composite
+            # action.
+            editable_fields = set()
+            readonly_fields = []
+            for step in steps:
+                editable_fields.update(self.get_object_action_form(request, obj, step).base_fields)
+                readonly_fields.extend(self.get_object_action_readonly_fields(request, obj, step))
+            return tuple(OrderedDict.fromkeys(f for f in readonly_fields if f not in editable_fields))
         return ()
 
     def get_object_action_fields(self, request, obj, form, action):
@@ -114,6 +298,9 @@ class ModelAdminObjectActionsMixin(object):
         return self.get_object_action_option(action, 'form_template')
 
     def has_object_action_permission(self, request, obj, action):
+        steps = self.get_object_action_option(action, 'steps')
+        if steps and not all(self.has_object_action_permission(request, obj, step) for step in steps):
+            return False
         permission = self.get_object_action_option(action, 'permission', 'change')
         assert permission != 'object_action'
         has_perm_method = getattr(self, 'has_{}_permission'.format(permission), None)
@@ -123,31 +310,281 @@ class ModelAdminObjectActionsMixin(object):
         codename = get_permission_codename(permission, opts)
         return request.user.has_perm('%s.%s' % (opts.app_label, codename), obj)
 
+    def has_object_action_permissions(self, request, objs, action):
+        if not self.get_object_action_option(action, 'object_permission', True):
+            has_permission = self.has_object_action_permission(request, None, action)
+            return dict((obj.pk, has_permission) for obj in objs)
+        return dict((obj.pk, self.has_object_action_permission(request, obj, action)) for obj in objs)
+
+    def get_object_action_condition(self, request, action):
+        condition = self.get_object_action_option(action, 'condition', None)
+        if isinstance(condition, six.string_types):
+            condition = getattr(self, condition)
+        if callable(condition):
+            condition = condition(request)
+        # A composite action is only available when all of its steps are.
+        for step in self.get_object_action_option(action, 'steps', None) or ():
+            step_condition = self.get_object_action_condition(request, step)
+            if step_condition is not None:
+                condition = step_condition if condition is None else condition & step_condition
+        return condition
+
+    def get_object_action_conditions(self, request, objs, actions):
+        # Evaluate the conditions of all actions for all objects in a single
+        # query, annotating each object with whether each condition holds.
+        conditions = OrderedDict()
+        for action in actions:
+            condition = self.get_object_action_condition(request, action)
+            if condition is not None:
+                conditions[action] = condition
+        objs = [obj for obj in objs if obj.pk is not None]
+        if not conditions or not objs:
+            return {}
+        aliases = OrderedDict(('_object_action_condition_{}'.format(n), action) for n, action in enumerate(conditions))
+        annotations = dict(
+            (alias, Case(When(conditions[action], then=Value(True)), default=Value(False), output_field=BooleanField()))
+            for alias, action in aliases.items()
+        )
+        # Conditions may use annotations of the admin's queryset.
+        queryset = self.get_queryset(request).using(objs[0]._state.db).filter(pk__in=[obj.pk for obj in objs]).order_by()
+        results = dict((action, dict.fromkeys([obj.pk for obj in objs], False)) for action in conditions)
+        # Conditions spanning multi-valued relations may return an object more
+        # than once, so the condition holds if it holds for any of its rows.
+        for values in queryset.annotate(**annotations).values('pk', *aliases):
+            for alias, action in aliases.items():
+                results[action][values['pk']] = results[action][values['pk']] or values[alias]
+        return dict(((action, pk), result) for action in conditions for pk, result in results[action].items())
+
+    def has_object_action_condition(self, request, obj, action):
+        condition = self.get_object_action_condition(request, action)
+        if condition is None or obj is None:
+            return True
+        return self.get_queryset(request).using(obj._state.db).filter(condition, pk=obj.pk).exists()
+
+    def get_object_action_request_cache(self, request):
+        opts = self.model._meta
+        request_caches = request.__dict__.setdefault('_object_action_cache', {})
+        return request_caches.setdefault((self.admin_site.name, opts.app_label, opts.model_name), {})
+
+    def get_object_action_permission_matrix(self, request, objs, actions=None):
+        if actions is None:
+            actions = [object_action['slug'] for object_action in self.get_object_actions()]
+        objs = [obj for obj in objs if obj.pk is not None]
+        matrix = self.get_object_action_request_cache(request).setdefault('permissions', {})
+        for action in actions:
+            for pk, has_permission in self.has_object_action_permissions(request, objs, action).items():
+                matrix[(action, pk)] = has_permission
+        for key, has_condition in self.get_object_action_conditions(request, objs, actions).items():
+            matrix[key] = matrix[key] and has_condition
+        return matrix
+
+    def has_cached_object_action_permission(self, request, obj, action):
+        matrix = self.get_object_action_request_cache(request).setdefault('permissions', {})
+        key = (action, obj.pk)
+        if key not in matrix:
+            matrix[key] = self.has_object_action_permission(request, obj, action) and self.has_object_action_condition(request, obj, action)
+        return matrix[key]
+
+    def get_object_action_url_template(self, request, action):
+        url_templates = self.get_object_action_request_cache(request).setdefault('url_templates', {})
+        if action not in url_templates:
+            view_name = self.get_object_action_view_name(action)
+            url = reverse('admin:{}'.format(view_name), args=[OBJECT_ID_PLACEHOLDER], current_app=self.admin_site.name)
+            url_templates[action] = tuple(url.split(OBJECT_ID_PLACEHOLDER, 1))
+        return url_templates[action]
+
+    def get_object_action_url(self, request, obj, action):
+        prefix, suffix = self.get_object_action_url_template(request, action)
+        # Quote the object ID the same way reverse() quotes URL arguments.
+        return prefix + quote(six.text_type(obj.pk), safe=RFC3986_SUBDELIMS + '/~:@') + suffix
+
+    def get_object_action_next_url(self, request):
+        request_cache = self.get_object_action_request_cache(request)
+        if 'next_url' not in request_cache:
+            request_cache['next_url'] = conditional_escape(request.get_full_path())
+        return request_cache['next_url']
+
     def get_object_action_display(self, request, obj, action):
         verbose_name = self.get_object_action_verbose_name(request, obj, action)
         verbose_name = verbose_name[0].upper() + verbose_name[1:]
-        view_name = self.get_object_action_view_name(action)
-        href = reverse('admin:{}'.format(view_name), args=[obj.pk], current_app=self.admin_site.name)
-        next_url = request.get_full_path()
+        href = self.get_object_action_url(request, obj, action)
+        next_url = self.get_object_action_next_url(request)
+        if self.has_object_action_token_link(action):
+            token = self.get_object_action_token(request, obj, action)
+            return format_html(
+                '<a class="button" href="{}?next={}&amp;{}={}">{}</a>', href, next_url, OBJECT_ACTION_TOKEN_PARAM, token, verbose_name,
+            )
         return format_html('<a class="button" href="{}?next={}">{}</a>', href, next_url, verbose_name)
 
+    def get_object_action_bound_admin(self, request):
+        # Copy of this ModelAdmin bound to the request, used as the model admin
+        # of the change list and admin forms, so that the object actions
+        # columns and fields do not need to look up the current request.
+        request_cache = self.get_object_action_request_cache(request)
+        bound_admin = request_cache.get('bound_admin', None)
+        if bound_admin is None:
+            # Create lazily initialized state before copying, so that it is
+            # shared with this ModelAdmin instead of being discarded with the
+            # copy.
+            self.get_object_actions_index()
+            self.get_object_action_fragment_cache()
+            self.__dict__.setdefault('_object_action_form_cache', OrderedDict())
+            bound_admin = copy.copy(self)
+            bound_admin.object_action_request = request
+            request_cache['bound_admin'] = bound_admin
+            self.get_object_action_next_url(request)
+            for object_action in self.get_object_actions():
+                self.get_object_action_url_template(request, object_action['slug'])
+        return bound_admin
+
+    def get_object_action_current_request(self):
+        request = self.__dict__.get('object_action_request', None)
+        if request is None:
+            request = get_current_request()
+        return request
+
     def display_object_actions(self, obj=None, list_only=False, detail_only=False):
         empty_value_display = self.get_empty_value_display()
         if not obj or not obj.pk:
             return empty_value_display
-        request = get_current_request()
-        actions_display = []
+        request = self.get_object_action_current_request()
+        if request is None:
+            return empty_value_display
+        with self.object_action_phase(request, None, 'column'):
+            if self.get_object_action_fragment_cache() is not None:
+                return self._display_cached_object_actions(request, obj, list_only, detail_only)
+            return self._display_object_actions(request, obj, list_only, detail_only)
+    display_object_actions.short_description = _('Object Actions')
+
+    def get_object_action_display_actions(self, request, obj, list_only=False, detail_only=False):
+        actions = []
         for object_action in self.get_object_actions(obj):
             if list_only and object_action.get('detail_only', False):
                 continue
             if detail_only and object_action.get('list_only', False):
                 continue
             action = object_action['slug']
-            if not self.has_object_action_permission(request, obj, action):
-                continue
-            actions_display.append(self.get_object_action_display(request, obj, action))
+            if self.has_cached_object_action_permission(request, obj, action):
+                actions.append(action)
+        return actions
+
+    def _display_object_actions(self, request, obj, list_only, detail_only, actions=None):
+        if actions is None:
+            actions = self.get_object_action_display_actions(request, obj, list_only, detail_only)
+        actions_display = [self.get_object_action_display(request, obj, action) for action in actions]
         return format_html_join(mark_safe('&nbsp;'), '{}', [(x,) for x in actions_display])
-    display_object_actions.short_description = _('Object Actions')
+
+    def _display_cached_object_actions(self, request, obj, list_only, detail_only):
+        actions = self.get_object_action_display_actions(request, obj, list_only, detail_only)
+        key = self.get_object_action_fragment_key(request, obj, actions, list_only, detail_only)
+        fragments = self.get_object_action_request_cache(request).setdefault('fragments', {})
+        fragment_cache = self.get_object_action_fragment_cache()
+        fragment = fragments[key] if key in fragments else fragment_cache.get(key)
+        if fragment is None:
+            fragment = six.text_type(self._display_object_actions(request, obj, list_only, detail_only, actions))
+            fragment_cache.set(key, fragment, self.object_action_fragment_cache_timeout)
+        fragments[key] = fragment
+        return mark_safe(fragment)
+
+    def get_object_action_fragment_cache(self):
+        if not self.object_action_fragment_cache:
+            return None
+        # Links of actions with idempotency tokens differ for every rendering.
+        if any(self.has_object_action_token_link(action) for action in self.get_object_actions_index()):
+            return None
+        if self.object_action_fragment_cache is True:
+            # Per-process LRU cache for this ModelAdmin.
+            fragment_cache = self.__dict__.get('_object_action_fragment_cache', None)
+            if fragment_cache is None:
+                fragment_cache = ObjectActionFragmentCache(self.object_action_fragment_cache_size)
+                self.__dict__['_object_action_fragment_cache'] = fragment_cache
+            return fragment_cache
+        return caches[self.object_action_fragment_cache]
+
+    def get_object_action_spec_version(self):
+        # Changes whenever the object actions are replaced or their options are
+        # changed, so that fragments rendered for other actions are not reused.
+        cached = self.__dict__.get('_object_action_spec_version', None)
+        if cached is None or cached[0] is not self.object_actions:
+            specs = []
+            for object_action in self.get_object_actions_index().values():
+                specs.append(sorted(
+                    (key, self.get_object_action_spec_value(value))
+                    for key, value in object_action.items()
+                ))
+            version = hashlib.md5(repr(specs).encode('utf-8')).hexdigest()
+            cached = (self.object_actions, version)
+            self.__dict__['_object_action_spec_version'] = cached
+        return cached[1]
+
+    def get_object_action_spec_value(self, value):
+        if isinstance(value, Promise):
+            return force_str(value)
+        if isinstance(value, (six.string_types, int, float, bool, tuple, list)):
+            return value
+        return type(value).__name__
+
+    def get_object_action_fragment_version_key(self, obj):
+        opts = self.model._meta
+        return 'admin_object_actions:fragment_version:{}:{}:{}'.format(self.admin_site.name, opts.label_lower, obj.pk)
+
+    def get_object_action_fragment_versions(self, request, objs):
+        versions = self.get_object_action_request_cache(request).setdefault('fragment_versions', {})
+        missing = dict((self.get_object_action_fragment_version_key(obj), obj.pk) for obj in objs if obj.pk not in versions)
+        if missing:
+            fragment_cache = self.get_object_action_fragment_cache()
+            for key, version in fragment_cache.get_many(list(missing)).items():
+                versions[missing.pop(key)] = version
+            for key, pk in missing.items():
+                # Start with a unique version, so that fragments cached before
+                # the version was evicted are never reused.
+                version = uuid.uuid4().hex
+                if not fragment_cache.add(key, version, None):
+                    version = fragment_cache.get(key)
+                versions[pk] = version
+        return dict((obj.pk, versions[obj.pk]) for obj in objs)
+
+    def get_object_action_fragment_key(self, request, obj, actions, list_only=False, detail_only=False):
+        opts = self.model._meta
+        version = self.get_object_action_fragment_versions(request, [obj])[obj.pk]
+        parts = [
+            self.admin_site.name,
+            opts.label_lower,
+            self.get_object_action_spec_version(),
+            'list' if list_only else 'detail' if detail_only else 'all',
+            get_language() or '',
+            six.text_type(obj.pk),
+            version or '',
+            ','.join(actions),
+            six.text_type(self.get_object_action_next_url(request)),
+        ]
+        return 'admin_object_actions:fragment:{}'.format(hashlib.md5('|'.join(parts).encode('utf-8')).hexdigest())
+
+    def prefetch_object_action_fragments(self, request, objs, list_only=False, detail_only=False):
+        objs = [obj for obj in objs if obj.pk is not None]
+        self.get_object_action_fragment_versions(request, objs)
+        keys = [
+            self.get_object_action_fragment_key(
+                request, obj, self.get_object_action_display_actions(request, obj, list_only, detail_only), list_only, detail_only,
+            ) for obj in objs
+        ]
+        fragments = self.get_object_action_request_cache(request).setdefault('fragments', {})
+        fragments.update(dict.fromkeys(keys))
+        fragments.update(self.get_object_action_fragment_cache().get_many(keys))
+        return fragments
+
+    def invalidate_object_action_fragments(self, request, objs):
+        fragment_cache = self.get_object_action_fragment_cache()
+        if fragment_cache is None or not objs:
+            return
+        keys = [self.get_object_action_fragment_version_key(obj) for obj in objs]
+
+        def invalidate():
+            for key in keys:
+                fragment_cache.set(key, uuid.uuid4().hex, None)
+        # Invalidate once the changes are committed, so that fragments rendered
+        # by concurrent requests before the commit are not cached as current.
+        transaction.on_commit(invalidate, using=router.db_for_write(self.model, instance=objs[0]))
 
     def display_object_actions_list(self, obj=None):
         return self.display_object_actions(obj, list_only=True)
@@ -157,24 +594,141 @@ class ModelAdminObjectActionsMixin(object):
         return self.display_object_actions(obj, detail_only=True)
     display_object_actions_detail.short_description = _('Object Actions')
 
+    def is_object_action_column_shown(self, list_display):
+        return any(
+            getattr(field, '__name__', field) == 'display_object_actions_list'
+            for field in list_display
+        )
+
+    def get_changelist_instance(self, request):
+        cl = super(ModelAdminObjectActionsMixin, self).get_changelist_instance(request)
+        if self.is_object_action_column_shown(cl.list_display):
+            list_actions = [
+                object_action['slug'] for object_action in self.get_object_actions()
+                if not object_action.get('detail_only', False)
+            ]
+            objs = list(cl.result_list)
+            with self.object_action_phase(request, None, 'permission'):
+                self.get_object_action_permission_matrix(request, objs, list_actions)
+            if self.get_object_action_fragment_cache() is not None:
+                self.prefetch_object_action_fragments(request, objs, list_only=True)
+        cl.model_admin = self.get_object_action_bound_admin(request)
+        return cl
+
+    def render_change_form(self, request, context, add=False, change=False, form_url='', obj=None):
+        admin_form = context.get('adminform', None)
+        if admin_form is not None and getattr(admin_form, 'model_admin', None) is self:
+            admin_form.model_admin = self.get_object_action_bound_admin(request)
+        return super(ModelAdminObjectActionsMixin, self).render_change_form(request, context, add, change, form_url, obj)
+
+    def save_model(self, request, obj, form, change):
+        super(ModelAdminObjectActionsMixin, self).save_model(request, obj, form, change)
+        if change:
+            self.invalidate_object_action_fragments(request, [obj])
+
+    def changelist_view(self, request, extra_context=None):
+        # Only the permission checks and the object actions column count
+        # towards the column budget.
+        label = 'Object actions column of {}'.format(self.model._meta.label_lower)
+        with self.object_action_query_budget(request, self.object_action_column_max_queries, label, ('permission', 'column')):
+            response = super(ModelAdminObjectActionsMixin, self).changelist_view(request, extra_context)
+            if self.is_object_action_phase_timed(request, None) and hasattr(response, 'render'):
+                with self.object_action_phase(request, None, 'render'):
+                    response.render()
+        return self.add_object_action_server_timing(request, response)
+
+    def get_actions(self, request):
+        actions = super(ModelAdminObjectActionsMixin, self).get_actions(request)
+        if self.actions is None:
+            return actions
+        for object_action in self.get_object_actions():
+            if not object_action.get('bulk', False):
+                continue
+            action = object_action['slug']
+            verbose_name = six.text_type(self.get_object_action_verbose_name(request, None, action))
+            description = '{} selected %(verbose_name_plural)s'.format(verbose_name[0].upper() + verbose_name[1:].replace('%', '%%'))
+            func = functools.partial(type(self).object_action_bulk_view, action=action)
+            name = 'object_action_{}'.format(action)
+            actions[name] = (func, name, description)
+        return actions
+
+    def get_object_action_url_view(self, action):
+        if self.is_object_action_async(action):
+            view = self.get_object_action_option(action, 'view', self.object_action_async_view)
+        else:
+            view = self.get_object_action_option(action, 'view', self.object_action_view)
+        if isinstance(view, six.string_types):
+            view = getattr(self, view)
+        wrapped_view = functools.partial(view, action=action)
+        return functools.update_wrapper(wrapped_view, view)
+
+    def object_action_dispatch_view(self, request, object_id, action, views):
+        return views[action](request, object_id)
+
     def get_urls(self):
         urls = super(ModelAdminObjectActionsMixin, self).get_urls()
+        object_action_views = OrderedDict()
         object_action_urls = []
+        object_action_async_urls = []
         for object_action in self.get_object_actions():
             action = object_action['slug']
-            view = self.get_object_action_option(action, 'view', self.object_action_view)
-            if isinstance(view, six.string_types):
-                view = getattr(self, view)
-            wrapped_view = functools.partial(view, action=action)
-            wrapped_view = functools.update_wrapper(wrapped_view, view)
+            view = self.get_object_action_url_view(action)
+            # Check the action rather than the view, since partial objects are
+            # not detected as coroutine functions before Python 3.8.
+            if self.is_object_action_async(action) or iscoroutinefunction(getattr(view, 'func', view)):
+                object_action_async_urls.append(
+                    re_path(
+                        r'^(?P<object_id>\S+)/{}/$'.format(action),
+                        self.object_action_async_admin_view(view),
+                        name=self.get_object_action_view_name(action),
+                    )
+                )
+                continue
+            object_action_views[action] = self.admin_site.admin_view(view)
             object_action_urls.append(
                 re_path(
                     r'^(?P<object_id>\S+)/{}/$'.format(action),
-                    self.admin_site.admin_view(wrapped_view),
+                    object_action_views[action],
                     name=self.get_object_action_view_name(action),
                 )
             )
-        return object_action_urls + urls
+        opts = self.model._meta
+        object_action_task_urls = [
+            re_path(
+                r'^object-action-tasks/(?P<task_id>\d+)/$',
+                self.admin_site.admin_view(self.object_action_task_view),
+                name='{}_{}_object_action_task'.format(opts.app_label, opts.model_name),
+            ),
+        ]
+        if self.object_action_metrics:
+            object_action_task_urls.append(
+                re_path(
+                    r'^object-action-metrics/$',
+                    self.admin_site.admin_view(self.object_action_metrics_view),
+                    name='{}_{}_object_action_metrics'.format(opts.app_label, opts.model_name),
+                )
+            )
+        if self.object_action_history:
+            object_action_task_urls.append(
+                re_path(
+                    r'^(?P<object_id>\S+)/object-action-history/$',
+                    self.admin_site.admin_view(self.object_action_history_view),
+                    name='{}_{}_object_action_history'.format(opts.app_label, opts.model_name),
+                )
+            )
+        if self.object_action_url_dispatcher and object_action_views:
+            # A single pattern matching only known slugs is resolved for all
+            # sync actions; the per-action patterns are placed after the
+            # catch-all admin URLs so they remain available to reverse(). Async
+            # actions keep their own patterns, since the dispatcher is sync.
+            dispatch_view = functools.partial(self.object_action_dispatch_view, views=object_action_views)
+            dispatch_url = re_path(
+                r'^(?P<object_id>\S+)/(?P<action>{})/$'.format('|'.join(re.escape(action) for action in object_action_views)),
+                functools.update_wrapper(dispatch_view, self.object_action_dispatch_view),
+                name='{}_{}_object_action'.format(opts.app_label, opts.model_name),
+            )
+            return object_action_task_urls + object_action_async_urls + [dispatch_url] + urls + object_action_urls
+        return object_action_task_urls + object_action_async_urls + object_action_urls + urls
 
     def get_object_action_redirect_url(self, request, obj, action, redirect_field_name='next'):
         opts = self.model._meta
@@ -189,12 +743,12 @@ class ModelAdminObjectActionsMixin(object):
 
     def construct_object_action_log_message(self, request, obj, form, action):
         verbose_name = self.get_object_action_verbose_name(request, obj, action)
-        verbose_name_past = self.get_object_action_option(action, 'verbose_name_past', None) or verbose_name
+        verbose_name_past = self.get_object_action_verbose_name_past(request, obj, action) or verbose_name
         return '{}.'.format(verbose_name_past[0].upper() + verbose_name_past[1:])
 
     def construct_object_action_message(self, request, obj, form, action, exception=None):
         opts = self.model._meta
-        verbose_name_past = self.get_object_action_option(action, 'verbose_name_past', _('acted upon'))
+        verbose_name_past = self.get_object_action_verbose_name_past(request, obj, action) or _('acted upon')
         msg_dict = {
             'name': opts.verbose_name,
             'obj': obj,
@@ -212,8 +766,36 @@ class ModelAdminObjectActionsMixin(object):
                 **msg_dict
             )
 
+    def get_object_action_using(self, request, obj, action):
+        using = self.get_object_action_option(action, 'using', None)
+        if isinstance(using, six.string_types) and hasattr(self, using):
+            using = getattr(self, using)
+        if callable(using):
+            using = using(request, obj)
+        if using:
+            return using
+        if obj is not None:
+            return router.db_for_write(self.model, instance=obj)
+        return router.db_for_write(self.model)
+
+    def construct_object_action_log_entry(self, request, obj, message):
+        return LogEntry(
+            user_id=request.user.pk,
+            content_type_id=get_content_type_for_model(obj).pk,
+            object_id=six.text_type(obj.pk),
+            object_repr=six.text_type(obj)[:200],
+            action_flag=CHANGE,
+            change_message=message,
+        )
+
     def log_object_action(self, request, obj, message, action):
-        return self.log_change(request, obj, message)
+        using = self.get_object_action_using(request, obj, action)
+        if using == router.db_for_write(self.model):
+            return self.log_change(request, obj, message)
+        # Write the log entry on the same database as the object.
+        log_entry = self.construct_object_action_log_entry(request, obj, message)
+        log_entry.save(using=using)
+        return log_entry
 
     def response_object_action(self, request, obj, form, action, exception=None):
         msg = self.construct_object_action_message(request, obj, form, action, exception)
@@ -224,45 +806,813 @@ class ModelAdminObjectActionsMixin(object):
         redirect_url = self.get_object_action_redirect_url(request, obj, action)
         return HttpResponseRedirect(redirect_url)
 
+    def log_object_actions(self, request, log_entries, action):
+        if not log_entries:
+            return []
+        using = self.get_object_action_using(request, log_entries[0][0], action)
+        if using == router.db_for_write(self.model):
+            using = router.db_for_write(LogEntry)
+        return LogEntry.objects.using(using).bulk_create([
+            self.construct_object_action_log_entry(request, obj, message) for obj, message in log_entries
+        ])
+
+    def construct_object_action_history(self, request, obj, action, error=None, duration=None):
+        return ObjectActionLog(
+            content_type_id=get_content_type_for_model(obj).pk,
+            object_id=six.text_type(obj.pk),
+            object_repr=six.text_type(obj)[:200],
+            slug=action,
+            user_id=getattr(request.user, 'pk', None),
+            outcome=ObjectActionLog.OUTCOME_SUCCESS if error is None else ObjectActionLog.OUTCOME_FAILURE,
+            message='' if error is None else six.text_type(error),
+            duration=None if duration is None else timedelta(seconds=duration),
+        )
+
+    def log_object_action_history(self, request, results, action):
+        if not self.object_action_history or not results:
+            return
+        using = self.get_object_action_using(request, results[0][0], action)
+        history_using = using
+        if using == router.db_for_write(self.model):
+            history_using = router.db_for_write(ObjectActionLog)
+        history = [
+            self.construct_object_action_history(request, obj, action, error, duration)
+            for obj, error, duration in results
+        ]
+        # Buffer the history until the action's transaction commits, so that it
+        # is inserted with a single query (per chunk for bulk actions).
+        transaction.on_commit(functools.partial(ObjectActionLog.objects.using(history_using).bulk_create, history), using=using)
+
+    def get_object_action_metrics(self):
+        if not self.object_action_metrics:
+            return None
+        return get_object_action_metrics(self.object_action_metrics)
+
+    def get_object_action_server_timings(self, request):
+        if not self.object_action_server_timing:
+            return None
+        return self.get_object_action_request_cache(request).setdefault('server_timings', OrderedDict())
+
+    def object_action_phase(self, request, action, phase):
+        metrics = self.get_object_action_metrics() if action is not None else None
+        timings = self.get_object_action_server_timings(request)
+        counter = self.get_object_action_request_cache(request).get('query_counter', None)
+        if metrics is None and timings is None and counter is None:
+            return null_phase
+        return ObjectActionPhaseTimer(metrics, self.model._meta.label_lower, action, phase, timings, counter)
+
+    def is_object_action_phase_timed(self, request, action):
+        if self.object_action_server_timing or 'query_counter' in self.get_object_action_request_cache(request):
+            return True
+        return action is not None and self.get_object_action_metrics() is not None
+
+    def is_object_action_query_budget_enabled(self, request):
+        if not hasattr(connections[DEFAULT_DB_ALIAS], 'execute_wrapper'):
+            return False
+        if self.object_action_query_budgets is not None:
+            return self.object_action_query_budgets
+        return settings.DEBUG
+
+    def object_action_query_budget(self, request, budget, label, phases=None):
+        if budget is None or not self.is_object_action_query_budget_enabled(request):
+            return null_phase
+        return self._object_action_query_budget(request, budget, label, phases)
+
+    @contextlib.contextmanager
+    def _object_action_query_budget(self, request, budget, label, phases):
+        request_cache = self.get_object_action_request_cache(request)
+        counter = request_cache['query_counter'] = ObjectActionQueryCounter()
+        try:
+            with contextlib.ExitStack() as stack:
+                for alias in connections:
+                    stack.enter_context(connections[alias].execute_wrapper(counter))
+                yield counter
+        finally:
+            del request_cache['query_counter']
+        self.check_object_action_query_budget(request, counter, budget, label, phases)
+
+    def check_object_action_query_budget(self, request, counter, budget, label, phases=None):
+        budgets = budget.items() if isinstance(budget, dict) else [(None, budget)]
+        for phase, max_queries in budgets:
+            queries = counter.get_queries(phases if phase is None else [phase])
+            if len(queries) <= max_queries:
+                continue
+            msg = '{}{} ran {} queries, exceeding the budget of {}:\n{}'.format(
+                label,
+                '' if phase is None else ' ({})'.format(phase),
+                len(queries),
+                max_queries,
+                '\n'.join('[{}] {}'.format(query_phase or '-', sql) for query_phase, sql in queries),
+            )
+            if self.object_action_query_budget_mode == 'warn':
+                warnings.warn(msg, ObjectActionQueryBudgetWarning)
+            else:
+                raise ObjectActionQueryBudgetExceeded(msg)
+
+    def add_object_action_server_timing(self, request, response):
+        timings = self.get_object_action_server_timings(request)
+        if not timings:
+            return response
+        server_timing = ', '.join(
+            '{};desc="{}";dur={:.3f}'.format(phase, PHASE_DESCRIPTIONS.get(phase, phase), duration * 1000)
+            for phase, duration in timings.items()
+        )
+        if response.has_header('Server-Timing'):
+            server_timing = '{}, {}'.format(response['Server-Timing'], server_timing)
+        response['Server-Timing'] = server_timing
+        return response
+
+    def count_object_action(self, request, action, failed=False):
+        metrics = self.get_object_action_metrics()
+        if metrics is not None:
+            metrics.count(self.model._meta.label_lower, action, failed)
+
+    def construct_object_action_bulk_messages(self, request, results, action):
+        verbose_name = self.get_object_action_verbose_name(request, None, action)
+        verbose_name_past = self.get_object_action_verbose_name_past(request, None, action) or _('acted upon')
+        succeeded = [obj for obj, error in results if error is None]
+        failed = [(obj, error) for obj, error in results if error is not None]
+        bulk_messages = []
+        if succeeded:
+            bulk_messages.append((messages.SUCCESS, format_html(
+                _('Successfully {verbose_name_past} {count} {name}.'),
+                verbose_name_past=verbose_name_past,
+                count=len(succeeded),
+                name=model_ngettext(self.opts, len(succeeded)),
+            )))
+        if failed:
+            bulk_messages.append((messages.ERROR, format_html(
+                _('Failed to {verbose_name} {count} {name}: {errors}.'),
+                verbose_name=verbose_name,
+                count=len(failed),
+                name=model_ngettext(self.opts, len(failed)),
+                errors=format_html_join('; ', '"{}": {}', failed),
+            )))
+        return bulk_messages
+
+    def get_object_action_queryset_function(self, action):
+        queryset_function = self.get_object_action_option(action, 'queryset_function', None)
+        if isinstance(queryset_function, six.string_types):
+            queryset_function = getattr(self, queryset_function)
+        return queryset_function
+
+    def execute_object_action_queryset_function(self, request, queryset, action):
+        objs = list(queryset)
+        permissions = self.has_object_action_permissions(request, objs, action)
+        results = [(obj, _('permission denied')) for obj in objs if not permissions[obj.pk]]
+        objs = [obj for obj in objs if permissions[obj.pk]]
+        conditions = self.get_object_action_conditions(request, objs, [action])
+        results.extend((obj, _('not available')) for obj in objs if not conditions.get((action, obj.pk), True))
+        objs = [obj for obj in objs if conditions.get((action, obj.pk), True)]
+        if not objs:
+            return results
+        queryset_function = self.get_object_action_queryset_function(action)
+        start = time.monotonic()
+        try:
+            with transaction.atomic(using=queryset.db):
+                queryset_function(queryset.filter(pk__in=[obj.pk for obj in objs]))
+        except Exception as e:
+            results.extend((obj, e) for obj in objs)
+        else:
+            log_entries = [(obj, self.construct_object_action_log_message(request, obj, None, action)) for obj in objs]
+            self.log_object_actions(request, log_entries, action)
+            self.invalidate_object_action_fragments(request, objs)
+            results.extend((obj, None) for obj in objs)
+        # Objects updated by a single queryset function share its duration.
+        duration = time.monotonic() - start
+        pks = set(obj.pk for obj in objs)
+        self.log_object_action_history(request, [
+            (obj, error, duration if obj.pk in pks else None) for obj, error in results
+        ], action)
+        return results
+
+    def execute_object_action_chunk(self, request, pks, action, using=None):
+        if using is None:
+            using = self.get_object_action_using(request, None, action)
+        with transaction.atomic(using=using):
+            # Lock rows in primary key order so concurrent bulk actions acquire
+            # locks in the same order.
+            queryset = self.model._default_manager.using(using).select_for_update().filter(pk__in=pks).order_by('pk')
+            if self.get_object_action_queryset_function(action) is not None:
+                results = self.execute_object_action_queryset_function(request, queryset, action)
+            else:
+                results = self.execute_object_action_objects(request, queryset, action, using)
+        # Objects deleted since they were selected are reported as failures.
+        found = set(obj.pk for obj, error in results)
+        results.extend((pk, _('object does not exist')) for pk in pks if pk not in found)
+        return results
+
+    def execute_object_action_objects(self, request, queryset, action, using):
+        results = []
+        log_entries = []
+        durations = {}
+        objs = list(queryset)
+        permissions = self.has_object_action_permissions(request, objs, action)
+        conditions = self.get_object_action_conditions(request, objs, [action])
+        for obj in objs:
+            if not permissions[obj.pk]:
+                results.append((obj, _('permission denied')))
+                continue
+            if not conditions.get((action, obj.pk), True):
+                results.append((obj, _('not available')))
+                continue
+            form_class = self.get_object_action_form(request, obj, action)
+            form = form_class(request.POST, request.FILES, instance=obj, **self.get_object_action_form_kwargs(request, obj, action))
+            if not form.is_valid():
+                results.append((obj, ' '.join(e for errors in form.errors.values() for e in errors)))
+                continue
+            start = time.monotonic()
+            try:
+                with self.object_action_phase(request, action, 'execute'), transaction.atomic(using=using):
+                    with self.coalesce_object_action_saves(request, obj, action):
+                        new_object = self.save_form(request, form, change=True)
+            except Exception as e:
+                self.count_object_action(request, action, failed=True)
+                results.append((obj, e))
+            else:
+                self.count_object_action(request, action)
+                msg = self.construct_object_action_log_message(request, new_object, form, action)
+                log_entries.append((new_object, msg))
+                results.append((new_object, None))
+            durations[obj.pk] = time.monotonic() - start
+        if log_entries:
+            self.log_object_actions(request, log_entries, action)
+            self.invalidate_object_action_fragments(request, [obj for obj, msg in log_entries])
+        self.log_object_action_history(request, [(obj, error, durations.get(obj.pk)) for obj, error in results], action)
+        return results
+
+    def object_action_bulk_view(self, request, queryset, action=None):
+        chunk_size = self.get_object_action_option(action, 'bulk_chunk_size', self.object_action_bulk_chunk_size)
+        pks = list(queryset.order_by('pk').values_list('pk', flat=True))
+        # Act on the database the objects were selected from, falling back to
+        # the write database like QuerySet.update().
+        using = queryset._db or self.get_object_action_using(request, None, action)
+        results = []
+        for n in range(0, len(pks), chunk_size):
+            results.extend(self.execute_object_action_chunk(request, pks[n:n + chunk_size], action, using))
+        for level, msg in self.construct_object_action_bulk_messages(request, results, action):
+            self.message_user(request, msg, level)
+
+    def get_object_action_executor(self, request, obj, action):
+        return get_object_action_executor(self.get_object_action_option(action, 'executor', self.object_action_executor))
+
+    def submit_object_action_task(self, request, obj, form, action):
+        form_method = self.get_object_action_option(action, 'form_method', 'POST')
+        task = ObjectActionTask(
+            admin_site=self.admin_site.name,
+            content_type=get_content_type_for_model(self.model),
+            object_id=six.text_type(obj.pk),
+            slug=action,
+            user=request.user,
+        )
+        task.set_data(request.POST if form_method == 'POST' else request.GET)
+        task.save()
+        self.get_object_action_executor(request, obj, action).submit(task)
+        return task
+
+    def execute_object_action_task(self, task):
+        request = task.get_request()
+        action = task.slug
+        using = self.get_object_action_using(request, None, action)
+        obj = None
+        start = time.monotonic()
+        try:
+            with transaction.atomic(using=using):
+                obj = self.get_object_from_queryset(self.get_object_action_queryset(request, action).using(using), task.object_id)
+                if obj is None:
+                    raise self.model.DoesNotExist(_('object does not exist'))
+                if not self.has_object_action_permission(request, obj, action):
+                    raise PermissionDenied(_('permission denied'))
+                if not self.has_object_action_condition(request, obj, action):
+                    raise PermissionDenied(_('not available'))
+                form_class = self.get_object_action_form(request, obj, action)
+                form = form_class(request.POST, instance=obj, **self.get_object_action_form_kwargs(request, obj, action))
+                if not form.is_valid():
+                    raise ValidationError(form.errors)
+                with self.object_action_phase(request, action, 'execute'):
+                    with self.coalesce_object_action_saves(request, obj, action):
+                        new_object = self.save_form(request, form, change=True)
+                msg = self.construct_object_action_log_message(request, new_object, form, action)
+                self.log_object_action(request, new_object, msg, action)
+                self.invalidate_object_action_fragments(request, [new_object])
+                self.count_object_action(request, action)
+                self.log_object_action_history(request, [(new_object, None, time.monotonic() - start)], action)
+        except Exception as e:
+            # The transaction has been rolled back, so the failure is logged
+            # on its own.
+            if obj is not None:
+                self.count_object_action(request, action, failed=True)
+                self.log_object_action_history(request, [(obj, e, time.monotonic() - start)], action)
+            raise
+        return getattr(form, 'object_action_result', None)
+
+    def get_object_action_task_url(self, task):
+        opts = self.model._meta
+        return reverse('admin:{}_{}_object_action_task'.format(opts.app_label, opts.model_name), args=[task.pk], current_app=self.admin_site.name)
+
+    def response_object_action_task(self, request, obj, form, action, task):
+        opts = self.model._meta
+        verbose_name_past = self.get_object_action_verbose_name_past(request, obj, action) or _('acted upon')
+        msg = format_html(
+            _('The {name} "{obj}" will be {verbose_name_past} in the background.'),
+            name=opts.verbose_name,
+            obj=obj,
+            verbose_name_past=verbose_name_past,
+        )
+        self.message_user(request, msg, messages.INFO)
+        return HttpResponseRedirect(self.get_object_action_task_url(task))
+
+    def object_action_task_view(self, request, task_id, extra_context=None):
+        opts = self.model._meta
+        task = get_object_or_404(
+            ObjectActionTask,
+            pk=task_id,
+            admin_site=self.admin_site.name,
+            content_type=get_content_type_for_model(self.model),
+        )
+        obj = self.get_object(request, task.object_id)
+        if not self.has_object_action_permission(request, obj, task.slug):
+            raise PermissionDenied
+        verbose_name = self.get_object_action_verbose_name(request, obj, task.slug)
+        context = dict(
+            self.admin_site.each_context(request),
+            title='{} {}'.format(verbose_name[0].upper() + verbose_name[1:], opts.verbose_name),
+            opts=opts,
+            app_label=opts.app_label,
+            task=task,
+            original=obj,
+            object=obj,
+            object_action_slug=task.slug,
+            object_action_verbose_name=verbose_name,
+            object_action_redirect_url=self.get_object_action_redirect_url(request, obj, task.slug),
+        )
+        context.update(extra_context or {})
+        request.current_app = self.admin_site.name
+        return TemplateResponse(request, [
+            'admin/{}/{}/object_action_task.html'.format(opts.app_label, opts.model_name),
+            'admin/{}/object_action_task.html'.format(opts.app_label),
+            'admin/object_action_task.html',
+        ], context)
+
+    def get_object_action_history_queryset(self, request, obj):
+        using = router.db_for_write(self.model, instance=obj)
+        history_using = using
+        if using == router.db_for_write(self.model):
+            history_using = router.db_for_read(ObjectActionLog)
+        return ObjectActionLog.objects.using(history_using).filter(
+            content_type=get_content_type_for_model(self.model),
+            object_id=six.text_type(obj.pk),
+        )
+
+    def object_action_history_view(self, request, object_id, extra_context=None):
+        opts = self.model._meta
+        obj = self.get_object(request, unquote(object_id))
+        if obj is None:
+            return self._get_obj_does_not_exist_redirect(request, opts, object_id)
+        has_permission = getattr(self, 'has_view_or_change_permission', self.has_change_permission)
+        if not has_permission(request, obj):
+            raise PermissionDenied
+        verbose_names = OrderedDict(
+            (object_action['slug'], self.get_object_action_verbose_name(request, obj, object_action['slug']))
+            for object_action in self.get_object_actions(obj)
+        )
+        queryset = self.get_object_action_history_queryset(request, obj)
+        action = request.GET.get('action', '')
+        if action in verbose_names:
+            queryset = queryset.filter(slug=action)
+        else:
+            action = ''
+        history = list(queryset.select_related('user').order_by('-timestamp')[:self.object_action_history_limit])
+        for entry in history:
+            entry.verbose_name = verbose_names.get(entry.slug, entry.slug)
+        context = dict(
+            self.admin_site.each_context(request),
+            title=_('Action history: %s') % obj,
+            opts=opts,
+            app_label=opts.app_label,
+            original=obj,
+            object=obj,
+            object_action_history=history,
+            object_action_verbose_names=verbose_names,
+            object_action_slug=action,
+        )
+        context.update(extra_context or {})
+        request.current_app = self.admin_site.name
+        return TemplateResponse(request, [
+            'admin/{}/{}/object_action_history.html'.format(opts.app_label, opts.model_name),
+            'admin/{}/object_action_history.html'.format(opts.app_label),
+            'admin/object_action_history.html',
+        ], context)
+
+    def get_object_action_metrics_stats(self, request):
+        stats = []
+        for stat in self.get_object_action_metrics().get_stats():
+            try:
+                model = apps.get_model(stat['model'])
+            except LookupError:
+                continue
+            model_admin = self.admin_site._registry.get(model, None)
+            if model_admin is None:
+                continue
+            has_permission = getattr(model_admin, 'has_view_or_change_permission', model_admin.has_change_permission)
+            if not has_permission(request):
+                continue
+            if isinstance(model_admin, ModelAdminObjectActionsMixin):
+                verbose_name = model_admin.get_object_action_verbose_name(request, None, stat['action'])
+            else:
+                verbose_name = stat['action']
+            stats.append(dict(stat, opts=model._meta, verbose_name=verbose_name))
+        return stats
+
+    def object_action_metrics_view(self, request, extra_context=None):
+        opts = self.model._meta
+        stats = self.get_object_action_metrics_stats(request)
+        for stat in stats:
+            # Latencies are shown in milliseconds.
+            stat['phases'] = [
+                dict([(key, value if key == 'count' else value * 1000) for key, value in values.items()], phase=phase)
+                for phase, values in stat['phases'].items()
+            ]
+        context = dict(
+            self.admin_site.each_context(request),
+            title=_('Object action metrics'),
+            opts=opts,
+            app_label=opts.app_label,
+            object_action_metrics=stats,
+        )
+        context.update(extra_context or {})
+        request.current_app = self.admin_site.name
+        return TemplateResponse(request, [
+            'admin/{}/{}/object_action_metrics.html'.format(opts.app_label, opts.model_name),
+            'admin/{}/object_action_metrics.html'.format(opts.app_label),
+            'admin/object_action_metrics.html',
+        ], context)
+
     def object_action_view(self, request, object_id, form_url='', extra_context=None, action=None):
         return self.object_action_form_view(request, object_id, form_url, extra_context, action)
 
     def object_action_form_view(self, request, object_id, form_url='', extra_context=None, action=None):
-        with transaction.atomic(using=router.db_for_write(self.model)):
-            return self._object_action_form_view(request, object_id, form_url, extra_context, action)
+        idempotency_key = self.get_object_action_idempotency_key(request, object_id, action)
+        if idempotency_key is not None:
+            response = self.start_object_action_idempotency(request, idempotency_key, action)
+            if response is not None:
+                return response
+        budget = self.get_object_action_option(action, 'max_queries', None)
+        label = 'Object action "{}" of {}'.format(action, self.model._meta.label_lower)
+        try:
+            # The budget is checked before the changes are committed, so that
+            # they are rolled back when it is exceeded.
+            with self.get_object_action_atomic(request, action, 'view'):
+                with self.object_action_query_budget(request, budget, label):
+                    response = self._object_action_form_view(request, object_id, form_url, extra_context, action)
+        except Exception:
+            if idempotency_key is not None:
+                self.get_object_action_idempotency_cache().delete(idempotency_key)
+            raise
+        if idempotency_key is not None:
+            self.finish_object_action_idempotency(request, idempotency_key, action, response)
+        return self.add_object_action_server_timing(request, response)
+
+    def has_object_action_idempotency(self, action):
+        return self.get_object_action_option(action, 'idempotency', self.object_action_idempotency)
+
+    def has_object_action_token(self, action):
+        # Async actions are not deduplicated, so they carry no token.
+        return self.has_object_action_idempotency(action) and not self.is_object_action_async(action)
+
+    def has_object_action_token_link(self, action):
+        # Actions submitted by following their link carry the token in the URL.
+        form_method = self.get_object_action_option(action, 'form_method', 'POST')
+        return form_method == 'GET' and self.has_object_action_token(action)
+
+    def get_object_action_token(self, request, obj, action):
+        return uuid.uuid4().hex
+
+    def get_object_action_idempotency_cache(self):
+        return caches[self.object_action_idempotency_cache]
+
+    def get_object_action_idempotency_key(self, request, object_id, action):
+        if not self.has_object_action_idempotency(action) or not self.is_object_action_submission(request, action):
+            return None
+        token = request.POST.get(OBJECT_ACTION_TOKEN_PARAM, request.GET.get(OBJECT_ACTION_TOKEN_PARAM, ''))
+        if not re.match(r'^[0-9a-f]{32}$', token):
+            return None
+        # Tokens are scoped to the user, so that they cannot be replayed by
+        # other users.
+        parts = [
+            self.admin_site.name,
+            self.model._meta.label_lower,
+            action,
+            six.text_type(object_id),
+            six.text_type(getattr(request.user, 'pk', '')),
+            token,
+        ]
+        return 'admin_object_actions:idempotency:{}'.format(hashlib.md5('|'.join(parts).encode('utf-8')).hexdigest())
+
+    def start_object_action_idempotency(self, request, key, action):
+        # Returns None when the submission should be processed, or the response
+        # replaying the outcome of the original submission.
+        cache = self.get_object_action_idempotency_cache()
+        deadline = time.monotonic() + self.object_action_idempotency_wait
+        while True:
+            if cache.add(key, OBJECT_ACTION_TOKEN_PENDING, self.object_action_idempotency_timeout):
+                self.get_object_action_request_cache(request)['idempotency_messages'] = []
+                return None
+            outcome = cache.get(key)
+            if outcome is not None and outcome != OBJECT_ACTION_TOKEN_PENDING:
+                return self.replay_object_action(request, outcome, action)
+            # Also wait when the outcome has expired or could not be read, so
+            # that a failing cache backend does not make this loop spin.
+            if time.monotonic() >= deadline:
+                break
+            time.sleep(0.1)
+        msg = format_html(
+            _('The {name} is already being {verbose_name_past}.'),
+            name=self.model._meta.verbose_name,
+            verbose_name_past=self.get_object_action_verbose_name_past(request, None, action) or _('acted upon'),
+        )
+        self.message_user(request, msg, messages.WARNING)
+        return HttpResponseRedirect(self.get_object_action_redirect_url(request, None, action))
+
+    def finish_object_action_idempotency(self, request, key, action, response):
+        cache = self.get_object_action_idempotency_cache()
+        recorded_messages = self.get_object_action_request_cache(request).pop('idempotency_messages', [])
+        # Only completed submissions are recorded, so that the form may be
+        # submitted again with the same token after validation errors.
+        if not isinstance(response, HttpResponseRedirect):
+            cache.delete(key)
+            return
+        outcome = {
+            'location': response['Location'],
+            'messages': recorded_messages,
+        }
+        cache.set(key, outcome, self.object_action_idempotency_timeout)
+
+    def replay_object_action(self, request, outcome, action):
+        for level, msg in outcome['messages']:
+            self.message_user(request, msg, level)
+        return HttpResponseRedirect(outcome['location'])
+
+    def message_user(self, request, message, level=messages.INFO, *args, **kwargs):
+        recorded_messages = self.get_object_action_request_cache(request).get('idempotency_messages', None)
+        if recorded_messages is not None:
+            recorded_messages.append((level, message))
+        return super(ModelAdminObjectActionsMixin, self).message_user(request, message, level, *args, **kwargs)
 
     def _object_action_form_view(self, request, object_id, form_url, extra_context, action):
+        with self.get_object_action_atomic(request, action, 'execute'):
+            response, obj, form = self._get_object_action_view_form(request, object_id, action)
+            if response is None and form.is_bound and self.validate_object_action_form(request, form, action):
+                return self._execute_object_action_view_form(request, obj, form, action)
+        if response is not None:
+            return response
+        return self._render_object_action_view_form(request, obj, form, form_url, extra_context, action)
+
+    def _execute_object_action_view_form(self, request, obj, form, action):
+        if self.get_object_action_option(action, 'execution', 'request') == 'background':
+            task = self.submit_object_action_task(request, obj, form, action)
+            return self.response_object_action_task(request, obj, form, action, task)
+        using = self.get_object_action_using(request, obj, action)
+        # Ensure the action runs in a transaction on the object's database
+        # when it differs from the database of the view transaction.
+        with contextlib.ExitStack() if connections[using].in_atomic_block else transaction.atomic(using=using):
+            start = time.monotonic()
+            try:
+                with self.object_action_phase(request, action, 'execute'):
+                    with self.coalesce_object_action_saves(request, obj, action):
+                        new_object = self.save_form(request, form, change=True)
+            except Exception as e:
+                self.count_object_action(request, action, failed=True)
+                self.log_object_action_history(request, [(obj, e, time.monotonic() - start)], action)
+                return self.response_object_action(request, obj, form, action, exception=e)
+            else:
+                self.count_object_action(request, action)
+                self.log_object_action_history(request, [(new_object, None, time.monotonic() - start)], action)
+                return self._response_object_action_done(request, obj, new_object, form, action)
+
+    def _get_object_action_view_form(self, request, object_id, action):
         opts = self.model._meta
-        obj = self.get_object(request, unquote(object_id))
-        if not self.has_object_action_permission(request, obj, action):
+        try:
+            with self.object_action_phase(request, action, 'fetch'):
+                obj = self.get_object_action_object(request, object_id, action)
+        except ObjectActionLocked as e:
+            if not self.has_object_action_permission(request, e.obj, action):
+                raise PermissionDenied
+            return self.response_object_action(request, e.obj, None, action, exception=e), e.obj, None
+        with self.object_action_phase(request, action, 'permission'):
+            has_permission = self.has_object_action_permission(request, obj, action)
+            # The condition holds for missing objects, which are redirected.
+            has_permission = has_permission and self.has_object_action_condition(request, obj, action)
+        if not has_permission:
             raise PermissionDenied
 
         if obj is None:
-            return self._get_obj_does_not_exist_redirect(request, opts, object_id)
+            return self._get_obj_does_not_exist_redirect(request, opts, object_id), None, None
+
+        with self.object_action_phase(request, action, 'form'):
+            form = self.get_object_action_form_instance(request, obj, action)
+        return None, obj, form
+
+    def validate_object_action_form(self, request, form, action):
+        with self.object_action_phase(request, action, 'validate'):
+            return form.is_valid()
 
+    def is_object_action_submission(self, request, action):
+        form_method = self.get_object_action_option(action, 'form_method', 'POST')
+        return request.method == 'POST' or request.method == form_method
+
+    def get_object_action_atomic(self, request, action, scope):
+        if self.get_object_action_option(action, 'transaction', 'view') != scope:
+            return contextlib.ExitStack()
+        if not self.is_object_action_submission(request, action):
+            if scope == 'execute' or self.get_object_action_option(action, 'read_database', False):
+                return contextlib.ExitStack()
+        return transaction.atomic(using=self.get_object_action_using(request, None, action))
+
+    def coalesce_object_action_saves(self, request, obj, action):
+        if not self.get_object_action_option(action, 'coalesce_saves', False):
+            return contextlib.ExitStack()
+        return self._coalesce_object_action_saves(request, obj, action)
+
+    @contextlib.contextmanager
+    def _coalesce_object_action_saves(self, request, obj, action):
+        # Snapshot the loaded field values and suppress saves of the instance
+        # while the action runs, then write all modified fields at once.
+        fields = [f for f in obj._meta.concrete_fields if not f.primary_key]
+        snapshot = copy.deepcopy(dict((f.attname, obj.__dict__[f.attname]) for f in fields if f.attname in obj.__dict__))
+        update_fields = set()
+
+        def save(*args, **kwargs):
+            update_fields.update(kwargs.get('update_fields', None) or ())
+
+        obj.save = save
+        try:
+            yield obj
+        finally:
+            del obj.save
+        for f in fields:
+            if f.attname not in obj.__dict__:
+                continue
+            if f.attname not in snapshot or snapshot[f.attname] != obj.__dict__[f.attname]:
+                update_fields.add(f.name)
+        if update_fields:
+            # Fields updated by save() itself, such as auto_now fields, are
+            # not modified by the action.
+            update_fields.update(f.name for f in fields if getattr(f, 'auto_now', False))
+            obj.save(update_fields=sorted(update_fields))
+
+    def get_object_from_queryset(self, queryset, object_id):
+        model = queryset.model
+        field = model._meta.pk
+        try:
+            object_id = field.to_python(object_id)
+            return queryset.get(**{field.name: object_id})
+        except (model.DoesNotExist, ValidationError, ValueError):
+            return None
+
+    def has_object_action_queryset(self, action):
+        return any(
+            self.get_object_action_option(action, option, None)
+            for option in ('queryset', 'select_related', 'prefetch_related', 'only', 'defer')
+        )
+
+    def get_object_action_queryset(self, request, action):
+        queryset = self.get_queryset(request)
+        queryset_hook = self.get_object_action_option(action, 'queryset', None)
+        if isinstance(queryset_hook, six.string_types):
+            queryset_hook = getattr(self, queryset_hook)
+        if queryset_hook is not None:
+            queryset = queryset_hook(request, queryset)
+        for option in ('select_related', 'prefetch_related', 'only', 'defer'):
+            value = self.get_object_action_option(action, option, None)
+            if value:
+                queryset = getattr(queryset, option)(*value)
+        return queryset
+
+    def get_object_action_object(self, request, object_id, action):
+        submission = self.is_object_action_submission(request, action)
+        lock = self.get_object_action_option(action, 'lock', False) if submission else False
+        read_database = self.get_object_action_option(action, 'read_database', False)
+        using = self.get_object_action_using(request, None, action)
+        if not lock and not read_database and using == router.db_for_write(self.model):
+            if not self.has_object_action_queryset(action):
+                return self.get_object(request, unquote(object_id))
+            return self.get_object_from_queryset(self.get_object_action_queryset(request, action), unquote(object_id))
+        if read_database and not submission:
+            queryset = self.get_object_action_queryset(request, action).using(router.db_for_read(self.model))
+            return self.get_object_from_queryset(queryset, unquote(object_id))
+        if not lock:
+            return self.get_object_from_queryset(self.get_object_action_queryset(request, action).using(using), unquote(object_id))
+        lock_kwargs = {'nowait': lock == 'nowait', 'skip_locked': lock == 'skip_locked'}
+        if getattr(connections[using].features, 'has_select_for_update_of', False):
+            lock_kwargs['of'] = ('self',)
+        queryset = self.get_object_action_queryset(request, action).using(using).select_for_update(**lock_kwargs)
+        try:
+            with transaction.atomic(using=using):
+                obj = self.get_object_from_queryset(queryset, unquote(object_id))
+        except NotSupportedError:
+            raise
+        except DatabaseError:
+            obj = None
+        if obj is None:
+            # Distinguish a row locked by another action from a missing one.
+            unlocked_obj = self.get_object_from_queryset(self.get_object_action_queryset(request, action).using(using), unquote(object_id))
+            if unlocked_obj is not None:
+                raise ObjectActionLocked(unlocked_obj)
+        return obj
+
+    def get_object_action_form_instance(self, request, obj, action):
         form_class = self.get_object_action_form(request, obj, action)
+        form_kwargs = self.get_object_action_form_kwargs(request, obj, action)
         form_method = self.get_object_action_option(action, 'form_method', 'POST')
-        if request.method == 'POST' or request.method == form_method:
+        if self.is_object_action_submission(request, action):
             if form_method == 'POST':
-                form = form_class(request.POST, request.FILES, instance=obj)
+                return form_class(request.POST, request.FILES, instance=obj, **form_kwargs)
             else:
-                form = form_class(request.GET, instance=obj)
-            if form.is_valid():
-                try:
-                    new_object = self.save_form(request, form, change=True)
-                except Exception as e:
-                    return self.response_object_action(request, obj, form, action, exception=e)
-                else:
-                    msg = self.construct_object_action_log_message(request, obj, form, action)
-                    self.log_object_action(request, new_object, msg, action)
-                    return self.response_object_action(request, new_object, form, action)
-        else:
-            form = form_class(instance=obj)
+                return form_class(request.GET, instance=obj, **form_kwargs)
+        return form_class(instance=obj, **form_kwargs)
 
-        context = self.get_object_action_form_context(request, obj, form, action)
-        context.update(extra_context or {})
+    def _response_object_action_done(self, request, obj, new_object, form, action):
+        with self.object_action_phase(request, action, 'log'):
+            msg = self.construct_object_action_log_message(request, obj, form, action)
+            self.log_object_action(request, new_object, msg, action)
+        self.invalidate_object_action_fragments(request, [new_object])
+        return self.response_object_action(request, new_object, form, action)
+
+    def _render_object_action_view_form(self, request, obj, form, form_url, extra_context, action):
+        with self.object_action_phase(request, action, 'render'):
+            context = self.get_object_action_form_context(request, obj, form, action)
+            context.update(extra_context or {})
+
+            response = self.render_object_action_form(request, context, obj=obj, form_url=form_url, action=action)
+            # Render the template within the phase when it is being timed.
+            if self.is_object_action_phase_timed(request, action) and hasattr(response, 'render'):
+                response.render()
+        return response
+
+    def is_object_action_async(self, action):
+        # Async views are supported since Django 3.1, although asgiref is
+        # already installed with Django 3.0.
+        if sync_to_async is None or django.VERSION < (3, 1):
+            return False
+        if self.get_object_action_option(action, 'execution', 'request') == 'background':
+            return False
+        form_class = self.get_object_action_option(action, 'form_class')
+        if form_class is not None:
+            return iscoroutinefunction(getattr(form_class, 'do_object_action', None))
+        function = self.get_object_action_option(action, 'function', None)
+        if isinstance(function, six.string_types):
+            function = getattr(self, function, getattr(self.model, function, None))
+        return iscoroutinefunction(function)
+
+    def object_action_async_admin_view(self, view):
+        admin_site = self.admin_site
+
+        async def inner(request, *args, **kwargs):
+            if not await sync_to_async(admin_site.has_permission)(request):
+                return await sync_to_async(admin_site.admin_view(view))(request, *args, **kwargs)
+            csrf_middleware = CsrfViewMiddleware(lambda request: None)
+            response = csrf_middleware.process_view(request, inner, args, kwargs)
+            if response is None:
+                response = await view(request, *args, **kwargs)
+            add_never_cache_headers(response)
+            return csrf_middleware.process_response(request, response)
+        return functools.update_wrapper(inner, view)
+
+    async def object_action_async_view(self, request, object_id, form_url='', extra_context=None, action=None):
+        return await self.object_action_async_form_view(request, object_id, form_url, extra_context, action)
+
+    async def object_action_async_form_view(self, request, object_id, form_url='', extra_context=None, action=None):
+        response = await self._object_action_async_form_view(request, object_id, form_url, extra_context, action)
+        return self.add_object_action_server_timing(request, response)
+
+    async def _object_action_async_form_view(self, request, object_id, form_url, extra_context, action):
+        # Async actions are not wrapped in a transaction, since a transaction
+        # cannot span the awaited action function.
+        response, obj, form = await sync_to_async(self._get_object_action_view_form)(request, object_id, action)
+        if response is not None:
+            return response
+        if form.is_bound and await sync_to_async(self.validate_object_action_form)(request, form, action):
+            start = time.monotonic()
+            try:
+                with self.object_action_phase(request, action, 'execute'):
+                    new_object = await self.asave_object_action_form(request, form)
+            except Exception as e:
+                self.count_object_action(request, action, failed=True)
+                await sync_to_async(self.log_object_action_history)(request, [(obj, e, time.monotonic() - start)], action)
+                return await sync_to_async(self.response_object_action)(request, obj, form, action, exception=e)
+            else:
+                self.count_object_action(request, action)
+                await sync_to_async(self.log_object_action_history)(request, [(new_object, None, time.monotonic() - start)], action)
+                return await sync_to_async(self._response_object_action_done)(request, obj, new_object, form, action)
+        return await sync_to_async(self._render_object_action_view_form)(request, obj, form, form_url, extra_context, action)
 
-        return self.render_object_action_form(request, context, obj=obj, form_url=form_url, action=action)
+    async def asave_object_action_form(self, request, form):
+        # Overrides of save_form() run as for sync actions, in a thread, since
+        # they may access the database.
+        if type(self).save_form is not ModelAdmin.save_form:
+            return await sync_to_async(self.save_form)(request, form, change=True)
+        return await form.asave(commit=False)
 
     def get_object_action_form_context(self, request, obj, form, action):
         opts = self.model._meta
@@ -271,7 +1621,7 @@ class ModelAdminObjectActionsMixin(object):
             self.get_object_action_fieldsets(request, obj, form, action),
             {},
             self.get_object_action_readonly_fields(request, obj, action),
-            model_admin=self,
+            model_admin=self.get_object_action_bound_admin(request),
         )
         media = self.media + admin_form.media
 
@@ -293,6 +1643,8 @@ class ModelAdminObjectActionsMixin(object):
             preserved_filters=self.get_preserved_filters(request),
             object_action_slug=action,
             object_action_verbose_name=verbose_name,
+            object_action_token_param=OBJECT_ACTION_TOKEN_PARAM,
+            object_action_token=self.get_object_action_token(request, obj, action) if self.has_object_action_token(action) else None,
         )
 
     def render_object_action_form(self, request, context, form_url='', obj=None, action=None):
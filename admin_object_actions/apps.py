@@ -10,3 +10,15 @@ class AdminObjectActionsConfig(AppConfig):
 
     name = 'admin_object_actions'
     verbose_name = _('Admin Object Actions')
+
+    def ready(self):
+        try:
+            from django.contrib.admin.sites import all_sites
+        except ImportError:
+            from django.contrib.admin import site
+            all_sites = [site]
+        from .admin import ModelAdminObjectActionsMixin
+        for admin_site in all_sites:
+            for model_admin in admin_site._registry.values():
+                if isinstance(model_admin, ModelAdminObjectActionsMixin) and model_admin.object_action_form_cache_warm:
+                    model_admin.warm_object_action_form_cache()
@@ -0,0 +1,57 @@
+# Python
+from __future__ import unicode_literals
+from collections import OrderedDict
+import threading
+import time
+
+
+class ObjectActionFragmentCache(object):
+    # Per-process LRU cache implementing the subset of the Django cache API used
+    # for caching rendered object action fragments.
+
+    def __init__(self, max_entries=10000):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def _get(self, key, now):
+        value, expires = self.entries.get(key, (None, None))
+        if expires is not None and expires <= now:
+            del self.entries[key]
+            return None
+        if value is not None:
+            self.entries.move_to_end(key)
+        return value
+
+    def get(self, key, default=None):
+        with self.lock:
+            value = self._get(key, time.monotonic())
+        return default if value is None else value
+
+    def get_many(self, keys):
+        now = time.monotonic()
+        with self.lock:
+            values = ((key, self._get(key, now)) for key in keys)
+            return dict((key, value) for key, value in values if value is not None)
+
+    def _set(self, key, value, timeout, now):
+        self.entries[key] = (value, None if timeout is None else now + timeout)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def set(self, key, value, timeout=None):
+        with self.lock:
+            self._set(key, value, timeout, time.monotonic())
+
+    def add(self, key, value, timeout=None):
+        now = time.monotonic()
+        with self.lock:
+            if self._get(key, now) is not None:
+                return False
+            self._set(key, value, timeout, now)
+        return True
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
@@ -0,0 +1,20 @@
+# Python
+from __future__ import unicode_literals
+
+# Django
+from django.utils.translation import gettext_lazy as _
+
+
+class ObjectActionLocked(Exception):
+
+    def __init__(self, obj, message=None):
+        super(ObjectActionLocked, self).__init__(message or _('it is locked by another action'))
+        self.obj = obj
+
+
+class ObjectActionQueryBudgetExceeded(Exception):
+    pass
+
+
+class ObjectActionQueryBudgetWarning(RuntimeWarning):
+    pass
@@ -0,0 +1,106 @@
+# Python
+from __future__ import unicode_literals
+from concurrent.futures import ThreadPoolExecutor
+import functools
+import threading
+
+# Six
+import six
+
+# Django
+from django.core.exceptions import ValidationError
+from django.db import connections, transaction
+from django.utils.module_loading import import_string
+from django.utils.timezone import now
+
+# Django-Admin-Object-Actions
+from .models import ObjectActionTask
+
+
+def run_object_action_task(task_id):
+    # Claim the task first so that it is only executed once, even when
+    # multiple workers are processing the same queue.
+    claimed = ObjectActionTask.objects.filter(pk=task_id, status=ObjectActionTask.STATUS_QUEUED).update(
+        status=ObjectActionTask.STATUS_RUNNING,
+        started=now(),
+    )
+    if not claimed:
+        return None
+    task = ObjectActionTask.objects.get(pk=task_id)
+    try:
+        result = task.get_model_admin().execute_object_action_task(task)
+    except ValidationError as e:
+        task.status = ObjectActionTask.STATUS_FAILED
+        task.error = ' '.join(e.messages)
+    except Exception as e:
+        task.status = ObjectActionTask.STATUS_FAILED
+        task.error = six.text_type(e)
+    else:
+        task.status = ObjectActionTask.STATUS_DONE
+        task.result = six.text_type(result) if result is not None else ''
+    task.finished = now()
+    task.save(update_fields=['status', 'result', 'error', 'finished'])
+    return task
+
+
+def run_queued_object_action_tasks(limit=None):
+    queryset = ObjectActionTask.objects.filter(status=ObjectActionTask.STATUS_QUEUED).order_by('pk')
+    task_ids = list(queryset.values_list('pk', flat=True)[:limit])
+    return [task for task in map(run_object_action_task, task_ids) if task is not None]
+
+
+class BaseObjectActionExecutor(object):
+
+    def submit(self, task):
+        raise NotImplementedError('submit has not been implemented')
+
+
+class ImmediateObjectActionExecutor(BaseObjectActionExecutor):
+
+    def submit(self, task):
+        transaction.on_commit(functools.partial(run_object_action_task, task.pk), using=task._state.db)
+
+
+class ThreadObjectActionExecutor(BaseObjectActionExecutor):
+
+    max_workers = 4
+
+    def __init__(self):
+        self.pool = None
+        self.lock = threading.Lock()
+
+    def get_pool(self):
+        with self.lock:
+            if self.pool is None:
+                self.pool = ThreadPoolExecutor(max_workers=self.max_workers)
+            return self.pool
+
+    def run(self, task_id):
+        try:
+            return run_object_action_task(task_id)
+        finally:
+            connections.close_all()
+
+    def submit(self, task):
+        transaction.on_commit(lambda: self.get_pool().submit(self.run, task.pk), using=task._state.db)
+
+
+class DatabaseObjectActionExecutor(BaseObjectActionExecutor):
+
+    def submit(self, task):
+        # Queued tasks are executed by the run_object_action_tasks command.
+        pass
+
+
+_executors = {}
+_executors_lock = threading.Lock()
+
+
+def get_object_action_executor(executor):
+    if isinstance(executor, BaseObjectActionExecutor):
+        return executor
+    with _executors_lock:
+        if executor not in _executors:
+            executor_class = import_string(executor) if isinstance(executor, six.string_types) else executor
+            _executors[executor] = executor_class()
+        return _executors[executor]
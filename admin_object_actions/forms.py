@@ -1,22 +1,149 @@
 # Python
 from __future__ import unicode_literals
+import asyncio
+from collections import OrderedDict
+from inspect import isawaitable
 
 # Django
 from django import forms
+from django.core.exceptions import NON_FIELD_ERRORS
+from django.forms.models import ALL_FIELDS, apply_limit_choices_to_to_formfield
+
+# ASGIRef
+try:
+    from asgiref.sync import async_to_sync
+except ImportError:
+    async_to_sync = None
+
+
+async def _await(awaitable):
+    return await awaitable
+
+
+def _run(awaitable):
+    # Run the result of an async action from sync code.
+    if async_to_sync is not None:
+        return async_to_sync(_await)(awaitable)
+    # Without asgiref (Django before 3.0), run it in a new event loop.
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(awaitable)
+    finally:
+        loop.close()
 
 
 class AdminObjectActionForm(forms.ModelForm):
 
+    # Function called with the instance and the form to execute the action,
+    # instead of do_object_action(); passed to each form instance by the
+    # ModelAdmin, or set on a form class.
+    do_object_action_callable = None
+
+    def __init__(self, *args, **kwargs):
+        formfield_callback = kwargs.pop('formfield_callback', None)
+        do_object_action_callable = kwargs.pop('do_object_action_callable', None)
+        super(AdminObjectActionForm, self).__init__(*args, **kwargs)
+        if do_object_action_callable is not None:
+            self.do_object_action_callable = do_object_action_callable
+        if formfield_callback is not None:
+            self.apply_formfield_callback(formfield_callback)
+
+    def apply_formfield_callback(self, formfield_callback):
+        # Rebuild model form fields for this instance, so that cached form
+        # classes can be shared while form fields still depend on the request.
+        opts = self._meta.model._meta
+        for name in list(self.fields):
+            if name not in (self._meta.fields or ()) or name in self.declared_fields:
+                continue
+            formfield = formfield_callback(opts.get_field(name), **self.get_formfield_kwargs(name))
+            if formfield is None:
+                del self.fields[name]
+            else:
+                apply_limit_choices_to_to_formfield(formfield)
+                self.fields[name] = formfield
+
+    def get_formfield_kwargs(self, name):
+        # Same keyword arguments as built by fields_for_model() from the Meta
+        # options of the form.
+        meta = self._meta
+        kwargs = {}
+        if meta.widgets and name in meta.widgets:
+            kwargs['widget'] = meta.widgets[name]
+        if meta.localized_fields == ALL_FIELDS or (meta.localized_fields and name in meta.localized_fields):
+            kwargs['localize'] = True
+        if meta.labels and name in meta.labels:
+            kwargs['label'] = meta.labels[name]
+        if meta.help_texts and name in meta.help_texts:
+            kwargs['help_text'] = meta.help_texts[name]
+        if meta.error_messages and name in meta.error_messages:
+            kwargs['error_messages'] = meta.error_messages[name]
+        if meta.field_classes and name in meta.field_classes:
+            kwargs['form_class'] = meta.field_classes[name]
+        return kwargs
+
     def do_object_action(self):
         raise NotImplementedError('do_object_action has not been implemented')
 
+    def get_object_action_result(self):
+        do_object_action_callable = self.__dict__.get('do_object_action_callable', None)
+        if do_object_action_callable is None:
+            # Not bound to the form when set on the form class.
+            do_object_action_callable = type(self).do_object_action_callable
+        if do_object_action_callable is not None:
+            return do_object_action_callable(self.instance, self)
+        else:
+            return self.do_object_action()
+
     def save(self, commit=True):
         try:
-            if hasattr(self, 'do_object_action_callable'):
-                self.object_action_result = self.do_object_action_callable(self.instance, self)
-            else:
-                self.object_action_result = self.do_object_action()
+            result = self.get_object_action_result()
+            if isawaitable(result):
+                result = _run(result)
+            self.object_action_result = result
         except Exception as e:
             self.add_error(None, str(e))
             raise
         return self.instance
+
+    async def asave(self, commit=True):
+        try:
+            result = self.get_object_action_result()
+            if isawaitable(result):
+                result = await result
+            self.object_action_result = result
+        except Exception as e:
+            self.add_error(None, str(e))
+            raise
+        return self.instance
+
+
+class AdminObjectActionStepsForm(AdminObjectActionForm):
+    # Form of a composite action, combining the fields of the forms of its
+    # steps, which are validated and run in order on the same instance.
+
+    def __init__(self, *args, **kwargs):
+        object_action_steps = kwargs.pop('object_action_steps', ())
+        super(AdminObjectActionStepsForm, self).__init__(*args, **kwargs)
+        self.step_forms = OrderedDict(
+            (step, form_class(*args, **dict(form_kwargs, instance=self.instance)))
+            for step, form_class, form_kwargs in object_action_steps
+        )
+
+    def full_clean(self):
+        super(AdminObjectActionStepsForm, self).full_clean()
+        for step_form in self.step_forms.values():
+            for field, errors in step_form.errors.items():
+                if field != NON_FIELD_ERRORS and field in self._errors:
+                    continue
+                self.add_error(field if field in self.fields else None, list(errors))
+
+    def validate_unique(self):
+        # Uniqueness is validated by the forms of the steps.
+        pass
+
+    def do_object_action(self):
+        result = None
+        for step_form in self.step_forms.values():
+            step_form.save()
+            result = step_form.object_action_result
+        return result
@@ -0,0 +1,27 @@
+# Python
+from __future__ import unicode_literals
+import time
+
+# Django
+from django.core.management.base import BaseCommand
+
+# Django-Admin-Object-Actions
+from admin_object_actions.executors import run_queued_object_action_tasks
+
+
+class Command(BaseCommand):
+
+    help = 'Run object action tasks queued by the database executor.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', default=False, help='Run queued tasks once and exit.')
+        parser.add_argument('--interval', type=float, default=1.0, help='Seconds to wait between polling for queued tasks.')
+        parser.add_argument('--limit', type=int, default=None, help='Maximum number of tasks to run per poll.')
+
+    def handle(self, *args, **options):
+        while True:
+            for task in run_queued_object_action_tasks(options['limit']):
+                self.stdout.write('{}: {}'.format(task, task.error or task.result))
+            if options['once']:
+                break
+            time.sleep(options['interval'])
@@ -0,0 +1,197 @@
+# Python
+from __future__ import unicode_literals
+from collections import OrderedDict
+import bisect
+import threading
+import time
+
+# Six
+import six
+
+# Django
+from django.utils.module_loading import import_string
+
+
+PHASES = ('fetch', 'permission', 'form', 'validate', 'execute', 'log', 'render')
+
+PHASE_DESCRIPTIONS = {
+    'fetch': 'get_object',
+    'permission': 'has_object_action_permission',
+    'form': 'get_object_action_form',
+    'validate': 'form.is_valid',
+    'execute': 'save_form',
+    'log': 'log_object_action',
+    'render': 'render',
+    'column': 'display_object_actions',
+}
+
+# Upper bounds (in seconds) of the histogram buckets, growing by a factor of
+# two every four buckets from 0.1ms to roughly 6.7 minutes.
+BUCKETS = tuple(0.0001 * 2 ** (n / 4.0) for n in range(89))
+
+
+class ObjectActionNullPhase(object):
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+
+null_phase = ObjectActionNullPhase()
+
+
+class ObjectActionPhaseTimer(object):
+
+    def __init__(self, metrics, model, action, phase, timings=None, counter=None):
+        self.metrics = metrics
+        self.model = model
+        self.action = action
+        self.phase = phase
+        self.timings = timings
+        self.counter = counter
+        self.start = None
+        self.previous_phase = None
+
+    def __enter__(self):
+        if self.counter is not None:
+            self.previous_phase = self.counter.phase
+            self.counter.phase = self.phase
+        self.start = time.monotonic()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        duration = time.monotonic() - self.start
+        if self.counter is not None:
+            self.counter.phase = self.previous_phase
+        if self.metrics is not None:
+            self.metrics.observe(self.model, self.action, self.phase, duration)
+        if self.timings is not None:
+            self.timings[self.phase] = self.timings.get(self.phase, 0.0) + duration
+        return False
+
+
+class ObjectActionQueryCounter(object):
+
+    def __init__(self):
+        self.phase = None
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        self.queries.append((self.phase, sql))
+        return execute(sql, params, many, context)
+
+    def get_queries(self, phases=None):
+        return [(phase, sql) for phase, sql in self.queries if phases is None or phase in phases]
+
+
+class ObjectActionHistogram(object):
+
+    def __init__(self):
+        self.buckets = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def observe(self, value):
+        self.buckets[bisect.bisect_left(BUCKETS, value)] += 1
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def percentile(self, q):
+        if not self.count:
+            return None
+        rank = q * self.count
+        cumulative = 0
+        for n, count in enumerate(self.buckets):
+            cumulative += count
+            if cumulative >= rank:
+                upper = BUCKETS[n] if n < len(BUCKETS) else self.max
+                return max(min(upper, self.max), self.min)
+        return self.max
+
+
+class BaseObjectActionMetrics(object):
+
+    def phase(self, model, action, phase):
+        return ObjectActionPhaseTimer(self, model, action, phase)
+
+    def observe(self, model, action, phase, duration):
+        raise NotImplementedError('observe has not been implemented')
+
+    def count(self, model, action, failed=False):
+        raise NotImplementedError('count has not been implemented')
+
+    def get_stats(self):
+        return []
+
+    def reset(self):
+        pass
+
+
+class InMemoryObjectActionMetrics(BaseObjectActionMetrics):
+
+    percentiles = (0.5, 0.95, 0.99)
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.counts = {}
+            self.histograms = {}
+
+    def observe(self, model, action, phase, duration):
+        with self.lock:
+            histograms = self.histograms.setdefault((model, action), {})
+            histogram = histograms.get(phase)
+            if histogram is None:
+                histogram = histograms[phase] = ObjectActionHistogram()
+            histogram.observe(duration)
+
+    def count(self, model, action, failed=False):
+        with self.lock:
+            counts = self.counts.setdefault((model, action), [0, 0])
+            counts[0] += 1
+            if failed:
+                counts[1] += 1
+
+    def get_stats(self):
+        stats = []
+        with self.lock:
+            for key in sorted(set(self.counts) | set(self.histograms)):
+                count, failures = self.counts.get(key, (0, 0))
+                histograms = self.histograms.get(key, {})
+                phases = OrderedDict()
+                for phase in sorted(histograms, key=lambda p: (PHASES.index(p) if p in PHASES else len(PHASES), p)):
+                    histogram = histograms[phase]
+                    phases[phase] = dict(count=histogram.count, mean=histogram.total / histogram.count)
+                    for q in self.percentiles:
+                        phases[phase]['p{}'.format(int(round(q * 100)))] = histogram.percentile(q)
+                stats.append({
+                    'model': key[0],
+                    'action': key[1],
+                    'count': count,
+                    'failures': failures,
+                    'phases': phases,
+                })
+        return stats
+
+
+_collectors = {}
+_collectors_lock = threading.Lock()
+
+
+def get_object_action_metrics(collector):
+    if isinstance(collector, BaseObjectActionMetrics):
+        return collector
+    with _collectors_lock:
+        if collector not in _collectors:
+            collector_class = import_string(collector) if isinstance(collector, six.string_types) else collector
+            _collectors[collector] = collector_class()
+        return _collectors[collector]
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:23
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ObjectActionTask',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('admin_site', models.CharField(max_length=100, verbose_name='admin site')),
+                ('object_id', models.TextField(verbose_name='object id')),
+                ('slug', models.CharField(max_length=100, verbose_name='action')),
+                ('data', models.TextField(blank=True, default='', verbose_name='form data')),
+                ('status', models.CharField(choices=[('queued', 'queued'), ('running', 'running'), ('done', 'done'), ('failed', 'failed')], db_index=True, default='queued', max_length=10, verbose_name='status')),
+                ('result', models.TextField(blank=True, default='', verbose_name='result')),
+                ('error', models.TextField(blank=True, default='', verbose_name='error')),
+                ('created', models.DateTimeField(auto_now_add=True, verbose_name='created')),
+                ('started', models.DateTimeField(default=None, null=True, verbose_name='started')),
+                ('finished', models.DateTimeField(default=None, null=True, verbose_name='finished')),
+                ('content_type', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='contenttypes.contenttype', verbose_name='content type')),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL, verbose_name='user')),
+            ],
+            options={
+                'verbose_name': 'object action task',
+                'verbose_name_plural': 'object action tasks',
+                'ordering': ('-created',),
+            },
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:35
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admin_object_actions', '0001_initial'),
+        ('contenttypes', '0002_remove_content_type_name'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ObjectActionLog',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('object_id', models.CharField(max_length=255, verbose_name='object id')),
+                ('object_repr', models.CharField(blank=True, default='', max_length=200, verbose_name='object repr')),
+                ('slug', models.CharField(max_length=100, verbose_name='action')),
+                ('outcome', models.CharField(choices=[('success', 'success'), ('failure', 'failure')], default='success', max_length=10, verbose_name='outcome')),
+                ('message', models.TextField(blank=True, default='', verbose_name='message')),
+                ('duration', models.DurationField(default=None, null=True, verbose_name='duration')),
+                ('timestamp', models.DateTimeField(default=django.utils.timezone.now, verbose_name='timestamp')),
+                ('content_type', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='contenttypes.contenttype', verbose_name='content type')),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL, verbose_name='user')),
+            ],
+            options={
+                'verbose_name': 'object action log',
+                'verbose_name_plural': 'object action logs',
+                'ordering': ('-timestamp',),
+                'indexes': [models.Index(fields=['content_type', 'object_id', '-timestamp'], name='object_action_log_object_idx'), models.Index(fields=['content_type', 'object_id', 'slug', '-timestamp'], name='object_action_log_action_idx'), models.Index(fields=['content_type', 'slug', 'timestamp'], name='object_action_log_slug_idx')],
+            },
+        ),
+    ]
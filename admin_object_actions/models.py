@@ -0,0 +1,204 @@
+# Python
+from __future__ import unicode_literals
+import json
+
+# Django
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.db import models
+from django.http import HttpRequest, QueryDict
+from django.utils.timezone import now
+from django.utils.translation import gettext_lazy as _
+
+
+class ObjectActionTask(models.Model):
+
+    STATUS_QUEUED = 'queued'
+    STATUS_RUNNING = 'running'
+    STATUS_DONE = 'done'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_QUEUED, _('queued')),
+        (STATUS_RUNNING, _('running')),
+        (STATUS_DONE, _('done')),
+        (STATUS_FAILED, _('failed')),
+    ]
+
+    class Meta:
+        ordering = ('-created',)
+        verbose_name = _('object action task')
+        verbose_name_plural = _('object action tasks')
+
+    admin_site = models.CharField(
+        max_length=100,
+        verbose_name=_('admin site'),
+    )
+    content_type = models.ForeignKey(
+        ContentType,
+        on_delete=models.CASCADE,
+        verbose_name=_('content type'),
+    )
+    object_id = models.TextField(
+        verbose_name=_('object id'),
+    )
+    slug = models.CharField(
+        max_length=100,
+        verbose_name=_('action'),
+    )
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        verbose_name=_('user'),
+    )
+    data = models.TextField(
+        blank=True,
+        default='',
+        verbose_name=_('form data'),
+    )
+    status = models.CharField(
+        max_length=10,
+        choices=STATUS_CHOICES,
+        default=STATUS_QUEUED,
+        db_index=True,
+        verbose_name=_('status'),
+    )
+    result = models.TextField(
+        blank=True,
+        default='',
+        verbose_name=_('result'),
+    )
+    error = models.TextField(
+        blank=True,
+        default='',
+        verbose_name=_('error'),
+    )
+    created = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name=_('created'),
+    )
+    started = models.DateTimeField(
+        null=True,
+        default=None,
+        verbose_name=_('started'),
+    )
+    finished = models.DateTimeField(
+        null=True,
+        default=None,
+        verbose_name=_('finished'),
+    )
+
+    def __str__(self):
+        return '{} {}:{} ({})'.format(self.slug, self.content_type_id, self.object_id, self.status)
+
+    @property
+    def is_finished(self):
+        return self.status in (self.STATUS_DONE, self.STATUS_FAILED)
+
+    def set_data(self, data):
+        self.data = json.dumps(dict((k, v) for k, v in data.lists() if k != 'csrfmiddlewaretoken'))
+
+    def get_data(self):
+        data = QueryDict('', mutable=True)
+        for key, values in json.loads(self.data or '{}').items():
+            data.setlist(key, values)
+        return data
+
+    def get_request(self):
+        # Build a minimal request for the ModelAdmin hooks that expect one when
+        # the task is executed outside of the original request.
+        request = HttpRequest()
+        request.method = 'POST'
+        request.user = self.user
+        request.POST = self.get_data()
+        return request
+
+    def get_model_admin(self):
+        try:
+            from django.contrib.admin.sites import all_sites
+        except ImportError:
+            from django.contrib.admin import site
+            all_sites = [site]
+        model = self.content_type.model_class()
+        for admin_site in all_sites:
+            if admin_site.name == self.admin_site and model in admin_site._registry:
+                return admin_site._registry[model]
+        raise LookupError('no admin registered for {} on {}'.format(model, self.admin_site))
+
+
+class ObjectActionLog(models.Model):
+
+    OUTCOME_SUCCESS = 'success'
+    OUTCOME_FAILURE = 'failure'
+    OUTCOME_CHOICES = [
+        (OUTCOME_SUCCESS, _('success')),
+        (OUTCOME_FAILURE, _('failure')),
+    ]
+
+    class Meta:
+        ordering = ('-timestamp',)
+        indexes = [
+            # Serve the history of a single object, for all actions or per action,
+            # in the order it is listed.
+            models.Index(fields=['content_type', 'object_id', '-timestamp'], name='object_action_log_object_idx'),
+            models.Index(fields=['content_type', 'object_id', 'slug', '-timestamp'], name='object_action_log_action_idx'),
+            # Serves "which objects had this action run recently" queries.
+            models.Index(fields=['content_type', 'slug', 'timestamp'], name='object_action_log_slug_idx'),
+        ]
+        verbose_name = _('object action log')
+        verbose_name_plural = _('object action logs')
+
+    content_type = models.ForeignKey(
+        ContentType,
+        on_delete=models.CASCADE,
+        verbose_name=_('content type'),
+    )
+    object_id = models.CharField(
+        max_length=255,
+        verbose_name=_('object id'),
+    )
+    object_repr = models.CharField(
+        max_length=200,
+        blank=True,
+        default='',
+        verbose_name=_('object repr'),
+    )
+    slug = models.CharField(
+        max_length=100,
+        verbose_name=_('action'),
+    )
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        verbose_name=_('user'),
+    )
+    outcome = models.CharField(
+        max_length=10,
+        choices=OUTCOME_CHOICES,
+        default=OUTCOME_SUCCESS,
+        verbose_name=_('outcome'),
+    )
+    message = models.TextField(
+        blank=True,
+        default='',
+        verbose_name=_('message'),
+    )
+    duration = models.DurationField(
+        null=True,
+        default=None,
+        verbose_name=_('duration'),
+    )
+    timestamp = models.DateTimeField(
+        default=now,
+        verbose_name=_('timestamp'),
+    )
+
+    def __str__(self):
+        return '{} {}:{} ({})'.format(self.slug, self.content_type_id, self.object_id, self.outcome)
+
+    @property
+    def is_success(self):
+        return self.outcome == self.OUTCOME_SUCCESS
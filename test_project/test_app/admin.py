@@ -2,6 +2,7 @@
 
 # Python
 from __future__ import unicode_literals
+import asyncio
 
 # Six
 import six
@@ -27,6 +28,11 @@ def do_fail(obj, form):
     raise NotImplementedError('this action is not yet implemented')
 
 
+async def do_ping(obj, form):
+    await asyncio.sleep(0)
+    return 'pong'
+
+
 @admin.register(TestModel)
 class TestModelAdmin(ModelAdminObjectActionsMixin, admin.ModelAdmin):
 
@@ -47,6 +53,11 @@ class TestModelAdmin(ModelAdminObjectActionsMixin, admin.ModelAdmin):
         'refreshed',
         'display_object_actions_detail',
     )
+    object_action_form_cache_warm = True
+    object_action_history = True
+    object_action_metrics = 'admin_object_actions.metrics.InMemoryObjectActionMetrics'
+    object_action_query_budgets = True
+    object_action_column_max_queries = 0
     object_actions = [
         {
             'slug': 'enable',
@@ -56,6 +67,8 @@ class TestModelAdmin(ModelAdminObjectActionsMixin, admin.ModelAdmin):
             'fields': ('name', 'enabled', 'confirm'),
             'readonly_fields': ('name', 'enabled',),
             'permission': 'enable',
+            'bulk': True,
+            'queryset_function': lambda qs: qs.update(enabled=True),
             'detail_only': True,
         },
         {
@@ -66,6 +79,7 @@ class TestModelAdmin(ModelAdminObjectActionsMixin, admin.ModelAdmin):
             'fieldsets': [(None, {'fields': ('name', 'enabled', 'confirm')})],
             'readonly_fields': ('name', 'enabled'),
             'permission': 'disable',
+            'lock': 'nowait',
             'detail_only': True,
         },
         {
@@ -74,6 +88,10 @@ class TestModelAdmin(ModelAdminObjectActionsMixin, admin.ModelAdmin):
             'verbose_name_past': _('refreshed'),
             'form_method': 'GET',
             'function': 'do_refresh',
+            'object_permission': False,
+            'max_queries': 10,
+            'only': ('name', 'refreshed'),
+            'bulk': True,
             'list_only': True,
         },
         {
@@ -91,6 +109,11 @@ class TestModelAdmin(ModelAdminObjectActionsMixin, admin.ModelAdmin):
             'fields': ('name', 'enabled'),
             'readonly_fields': ('enabled',),
             'function': 'do_update',
+            'transaction': 'execute',
+            'lock': True,
+            'read_database': True,
+            'bulk': True,
+            'idempotency': True,
         },
         {
             'slug': 'fail',
@@ -100,6 +123,30 @@ class TestModelAdmin(ModelAdminObjectActionsMixin, admin.ModelAdmin):
             'function': do_fail,
             'detail_only': True,
         },
+        {
+            'slug': 'sync',
+            'verbose_name': _('sync'),
+            'verbose_name_past': _('synced'),
+            'form_method': 'GET',
+            'function': 'do_sync',
+            'execution': 'background',
+            'detail_only': True,
+        },
+        {
+            'slug': 'ping',
+            'verbose_name': _('ping'),
+            'verbose_name_past': _('pinged'),
+            'form_method': 'GET',
+            'function': do_ping,
+            'detail_only': True,
+        },
+        {
+            'slug': 'reset',
+            'verbose_name': _('reset'),
+            'steps': ('disable', 'refresh', 'update'),
+            'lock': True,
+            'detail_only': True,
+        },
         {
             'slug': 'restrict',
             'verbose_name': _('restrict'),
@@ -114,6 +161,11 @@ class TestModelAdmin(ModelAdminObjectActionsMixin, admin.ModelAdmin):
         obj.refreshed = now()
         obj.save(update_fields=['refreshed'])
 
+    def do_sync(self, obj, form):
+        obj.refreshed = now()
+        obj.save(update_fields=['refreshed'])
+        return 'synced at {}'.format(obj.refreshed.isoformat())
+
     def do_update(self, obj, form):
         obj.name = form.cleaned_data['name']
         obj.save(update_fields=['name'])
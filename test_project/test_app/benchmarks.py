@@ -0,0 +1,218 @@
+# Python
+from __future__ import unicode_literals
+from collections import OrderedDict
+import contextlib
+import platform
+import statistics
+import time
+import types
+
+# Django
+import django
+from django.contrib import admin
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import re_path, reverse
+from django.utils.timezone import now
+
+# Django-Admin-Object-Actions
+import admin_object_actions
+from admin_object_actions.admin import ModelAdminObjectActionsMixin
+
+# Test App
+from .models import TestModel
+
+
+ROWS = (100, 1000)
+ACTIONS = (1, 10, 50)
+ADMINS = (10, 100)
+
+
+class BenchmarkModelAdmin(ModelAdminObjectActionsMixin, admin.ModelAdmin):
+
+    list_display = (
+        'name',
+        'enabled',
+        'refreshed',
+        'display_object_actions_list',
+    )
+    fields = (
+        'name',
+        'enabled',
+        'refreshed',
+        'display_object_actions_detail',
+    )
+    readonly_fields = (
+        'enabled',
+        'refreshed',
+        'display_object_actions_detail',
+    )
+    ordering = ('pk',)
+
+    def do_refresh(self, obj, form):
+        obj.refreshed = now()
+        obj.save(update_fields=['refreshed'])
+
+    def do_update(self, obj, form):
+        obj.name = form.cleaned_data['name']
+        obj.save(update_fields=['name'])
+
+
+def get_benchmark_object_actions(count):
+    # One form action, the rest are function actions shown in the change list.
+    object_actions = [
+        {
+            'slug': 'update',
+            'verbose_name': 'update',
+            'verbose_name_past': 'updated',
+            'fields': ('name',),
+            'function': 'do_update',
+        },
+    ]
+    for n in range(count - 1):
+        object_actions.append({
+            'slug': 'refresh{}'.format(n),
+            'verbose_name': 'refresh {}'.format(n),
+            'verbose_name_past': 'refreshed {}'.format(n),
+            'form_method': 'GET',
+            'function': 'do_refresh',
+        })
+    return object_actions
+
+
+def get_benchmark_model_admin_class(action_count, **attrs):
+    attrs.setdefault('object_actions', get_benchmark_object_actions(action_count))
+    return type(str('BenchmarkModelAdmin{}'.format(action_count)), (BenchmarkModelAdmin,), attrs)
+
+
+@contextlib.contextmanager
+def benchmark_admin_site(model_admin_class):
+    # Object action views reverse URLs in the "admin" namespace, so the site is
+    # installed as the only admin site of a temporary URLconf.
+    site = admin.AdminSite(name='admin')
+    site.register(TestModel, model_admin_class)
+    urlconf = types.ModuleType(str('benchmark_urls'))
+    urlconf.urlpatterns = [re_path(r'', site.urls)]
+    with override_settings(ROOT_URLCONF=urlconf):
+        yield site
+
+
+def ensure_benchmark_rows(count):
+    existing = TestModel.objects.count()
+    TestModel.objects.bulk_create([
+        TestModel(name='benchmark{}'.format(n)) for n in range(existing, count)
+    ])
+    return TestModel.objects.order_by('pk').first()
+
+
+def measure(func, repeat):
+    func()
+    timings = []
+    for n in range(repeat):
+        with CaptureQueriesContext(connection) as queries:
+            start = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - start)
+    return OrderedDict([
+        ('median', statistics.median(timings)),
+        ('min', min(timings)),
+        ('queries', len(queries)),
+    ])
+
+
+def request(client, method, url, data=None, status_code=200):
+    def run():
+        response = getattr(client, method)(url, data or {})
+        if response.status_code != status_code:
+            raise AssertionError('{} {} returned {}'.format(method.upper(), url, response.status_code))
+    return run
+
+
+def benchmark_changelist(client, rows, actions, repeat):
+    ensure_benchmark_rows(rows)
+    model_admin_class = get_benchmark_model_admin_class(actions, list_per_page=rows)
+    with benchmark_admin_site(model_admin_class):
+        url = reverse('admin:test_app_testmodel_changelist')
+        return measure(request(client, 'get', url), repeat)
+
+
+def benchmark_actions(client, actions, repeat):
+    obj = ensure_benchmark_rows(1)
+    results = OrderedDict()
+    with benchmark_admin_site(get_benchmark_model_admin_class(actions)):
+        update_url = reverse('admin:test_app_testmodel_update', args=[obj.pk])
+        results['action_form_get'] = measure(request(client, 'get', update_url), repeat)
+        results['action_form_post'] = measure(request(client, 'post', update_url, {'name': obj.name}, 302), repeat)
+        if actions > 1:
+            refresh_url = reverse('admin:test_app_testmodel_refresh0', args=[obj.pk])
+            results['action_function_get'] = measure(request(client, 'get', refresh_url, status_code=302), repeat)
+    return results
+
+
+def benchmark_get_urls(admins, actions, repeat, dispatcher=False):
+    site = admin.AdminSite(name='benchmark')
+    model_admin_class = get_benchmark_model_admin_class(actions, object_action_url_dispatcher=dispatcher)
+
+    def run():
+        for n in range(admins):
+            model_admin_class(TestModel, site).get_urls()
+    return measure(run, repeat)
+
+
+def run_benchmarks(rows=ROWS, actions=ACTIONS, admins=ADMINS, repeat=5, stdout=None):
+    user_model = get_user_model()
+    user = user_model._default_manager.filter(is_superuser=True).first()
+    if user is None:
+        user = user_model._default_manager.create_superuser('benchmark', 'benchmark@example.com', 'benchmark')
+    client = Client()
+    client.force_login(user)
+    scenarios = OrderedDict()
+
+    def add(name, result):
+        scenarios[name] = result
+        if stdout is not None:
+            stdout.write(format_benchmark(name, result))
+
+    for row_count in rows:
+        for action_count in actions:
+            name = 'changelist[rows={},actions={}]'.format(row_count, action_count)
+            add(name, benchmark_changelist(client, row_count, action_count, repeat))
+    for action_count in actions:
+        for name, result in benchmark_actions(client, action_count, repeat).items():
+            add('{}[actions={}]'.format(name, action_count), result)
+    for admin_count in admins:
+        for action_count in actions:
+            for dispatcher in (False, True):
+                name = 'get_urls[admins={},actions={},dispatcher={}]'.format(admin_count, action_count, int(dispatcher))
+                add(name, benchmark_get_urls(admin_count, action_count, repeat, dispatcher))
+    return OrderedDict([
+        ('meta', OrderedDict([
+            ('version', admin_object_actions.__version__),
+            ('django', django.get_version()),
+            ('python', platform.python_version()),
+            ('database', connection.vendor),
+            ('repeat', repeat),
+        ])),
+        ('scenarios', scenarios),
+    ])
+
+
+def format_benchmark(name, result):
+    return '{:<55} {:>10.2f}ms {:>10.2f}ms {:>6} queries'.format(
+        name, result['median'] * 1000, result['min'] * 1000, result['queries'],
+    )
+
+
+def compare_benchmarks(baseline, results, threshold=0.2):
+    regressions = []
+    for name, result in results['scenarios'].items():
+        base = baseline['scenarios'].get(name, None)
+        if base is None:
+            continue
+        if result['median'] > base['median'] * (1 + threshold):
+            regressions.append((name, 'median', base['median'], result['median']))
+        if result['queries'] > base['queries']:
+            regressions.append((name, 'queries', base['queries'], result['queries']))
+    return regressions
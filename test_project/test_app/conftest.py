@@ -1,5 +1,6 @@
 # Python
 from __future__ import unicode_literals
+import contextlib
 
 # py.test
 import pytest
@@ -19,3 +20,28 @@ def test_model(apps):
 @pytest.fixture
 def test_model_instance(test_model):
     return test_model.objects.create(name='test')
+
+
+@pytest.fixture
+def capture_on_commit_callbacks():
+    # Same as the django_capture_on_commit_callbacks fixture of newer
+    # pytest-django versions, which requires Django 3.2.
+    from django.db import DEFAULT_DB_ALIAS, connections
+
+    @contextlib.contextmanager
+    def capture(using=DEFAULT_DB_ALIAS, execute=False):
+        connection = connections[using]
+        start = len(connection.run_on_commit)
+        callbacks = []
+        try:
+            yield callbacks
+        finally:
+            while True:
+                new_callbacks = [item[1] for item in connection.run_on_commit[start:]]
+                start = len(connection.run_on_commit)
+                callbacks.extend(new_callbacks)
+                if not execute or not new_callbacks:
+                    break
+                for callback in new_callbacks:
+                    callback()
+    return capture
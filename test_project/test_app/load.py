@@ -0,0 +1,152 @@
+# Python
+from __future__ import unicode_literals
+from collections import OrderedDict
+import threading
+import time
+
+# Django
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import Client
+from django.urls import reverse
+
+# Django-Admin-Object-Actions
+from admin_object_actions.metrics import InMemoryObjectActionMetrics
+
+# Test App
+from .benchmarks import BenchmarkModelAdmin, benchmark_admin_site
+from .models import TestModel
+
+
+# Transaction and locking options of the increment action for each mode.
+MODES = OrderedDict([
+    ('view', {'transaction': 'view'}),
+    ('execute', {'transaction': 'execute'}),
+    ('lock', {'lock': True}),
+    ('nowait', {'lock': 'nowait'}),
+    ('skip_locked', {'lock': 'skip_locked'}),
+])
+
+SCENARIOS = ('same', 'different')
+
+
+class LoadModelAdmin(BenchmarkModelAdmin):
+
+    object_actions = [
+        dict({
+            'slug': mode,
+            'verbose_name': 'increment ({})'.format(mode),
+            'verbose_name_past': 'incremented ({})'.format(mode),
+            'fields': (),
+            'function': 'do_increment',
+        }, **options) for mode, options in MODES.items()
+    ]
+    think_time = 0.0
+
+    def do_increment(self, obj, form):
+        # Read-modify-write, so unlocked concurrent increments are lost.
+        if self.think_time:
+            time.sleep(self.think_time)
+        obj.counter += 1
+        obj.save(update_fields=['counter'])
+
+
+def percentile(values, q):
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+def run_load_scenario(site, user, mode, scenario, threads, requests, think_time=0.0):
+    model_admin = site._registry[TestModel]
+    model_admin.think_time = think_time
+    model_admin.object_action_metrics = metrics = InMemoryObjectActionMetrics()
+    objs = [TestModel.objects.get_or_create(name='load{}'.format(n))[0] for n in range(threads)]
+    TestModel.objects.filter(pk__in=[obj.pk for obj in objs]).update(counter=0)
+    targets = [objs[0] if scenario == 'same' else objs[n] for n in range(threads)]
+    clients = []
+    for n in range(threads):
+        client = Client()
+        client.force_login(user)
+        clients.append(client)
+    latencies = []
+    errors = []
+    barrier = threading.Barrier(threads)
+    lock = threading.Lock()
+
+    def worker(client, obj):
+        url = reverse('admin:test_app_testmodel_{}'.format(mode), args=[obj.pk])
+        try:
+            barrier.wait()
+            for n in range(requests):
+                start = time.perf_counter()
+                try:
+                    response = client.post(url, {})
+                    error = None if response.status_code == 302 else 'HTTP {}'.format(response.status_code)
+                except Exception as e:
+                    error = '{}: {}'.format(type(e).__name__, e)
+                with lock:
+                    latencies.append(time.perf_counter() - start)
+                    if error is not None:
+                        errors.append(error)
+        finally:
+            connection.close()
+
+    workers = [threading.Thread(target=worker, args=(client, obj)) for client, obj in zip(clients, targets)]
+    start = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    stats = dict(((stat['model'], stat['action']), stat) for stat in metrics.get_stats())
+    stat = stats.get(('test_app.testmodel', mode), {'count': 0, 'failures': 0, 'phases': {}})
+    successes = stat['count'] - stat['failures']
+    counter = sum(TestModel.objects.filter(pk__in=set(obj.pk for obj in targets)).values_list('counter', flat=True))
+    fetch = stat['phases'].get('fetch', {})
+    return OrderedDict([
+        ('mode', mode),
+        ('scenario', scenario),
+        ('threads', threads),
+        ('requests', threads * requests),
+        ('successes', successes),
+        ('failures', stat['failures']),
+        ('errors', len(errors)),
+        ('throughput', successes / elapsed if elapsed else 0.0),
+        ('p50', percentile(latencies, 0.5)),
+        ('p95', percentile(latencies, 0.95)),
+        ('p99', percentile(latencies, 0.99)),
+        # Locks are acquired when fetching the object for the action.
+        ('lock_wait_p50', fetch.get('p50', None)),
+        ('lock_wait_p99', fetch.get('p99', None)),
+        ('lost_updates', successes - counter),
+    ])
+
+
+def run_load(threads=8, requests=20, modes=tuple(MODES), scenarios=SCENARIOS, think_time=0.0, stdout=None):
+    user_model = get_user_model()
+    user = user_model._default_manager.filter(is_superuser=True).first()
+    if user is None:
+        user = user_model._default_manager.create_superuser('load', 'load@example.com', 'load')
+    results = []
+    with benchmark_admin_site(LoadModelAdmin) as site:
+        for mode in modes:
+            for scenario in scenarios:
+                result = run_load_scenario(site, user, mode, scenario, threads, requests, think_time)
+                results.append(result)
+                if stdout is not None:
+                    stdout.write(format_load_result(result))
+    return OrderedDict([
+        ('database', connection.vendor),
+        ('results', results),
+    ])
+
+
+def format_load_result(result):
+    def ms(value):
+        return '-' if value is None else '{:.1f}ms'.format(value * 1000)
+    return (
+        '{mode:<12} {scenario:<10} {throughput:>8.1f}/s ok={successes} failed={failures} errors={errors} '
+        'lost={lost_updates} p50={p50} p95={p95} p99={p99} lock_wait_p50={lock_wait_p50} lock_wait_p99={lock_wait_p99}'
+    ).format(**dict(result, **dict((key, ms(result[key])) for key in ('p50', 'p95', 'p99', 'lock_wait_p50', 'lock_wait_p99'))))
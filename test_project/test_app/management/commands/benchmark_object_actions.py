@@ -0,0 +1,52 @@
+# Python
+from __future__ import unicode_literals
+import json
+
+# Django
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import setup_databases, setup_test_environment, teardown_databases, teardown_test_environment
+
+# Test App
+from test_project.test_app.benchmarks import ACTIONS, ADMINS, ROWS, compare_benchmarks, run_benchmarks
+
+
+class Command(BaseCommand):
+
+    help = 'Benchmark object action rendering and views against a test database.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, nargs='+', default=list(ROWS), help='Change list sizes to benchmark.')
+        parser.add_argument('--actions', type=int, nargs='+', default=list(ACTIONS), help='Numbers of object actions to benchmark.')
+        parser.add_argument('--admins', type=int, nargs='+', default=list(ADMINS), help='Numbers of ModelAdmins for building URLs.')
+        parser.add_argument('--repeat', type=int, default=5, help='Number of timed runs per scenario.')
+        parser.add_argument('--output', default=None, help='Write the results as a JSON baseline to this file.')
+        parser.add_argument('--compare', default=None, help='Compare the results to a JSON baseline file.')
+        parser.add_argument('--threshold', type=float, default=0.2, help='Allowed relative slowdown compared to the baseline.')
+
+    def handle(self, *args, **options):
+        baseline = None
+        if options['compare']:
+            with open(options['compare']) as f:
+                baseline = json.load(f)
+        setup_test_environment()
+        old_config = setup_databases(verbosity=0, interactive=False, aliases={'default'})
+        try:
+            results = run_benchmarks(
+                rows=options['rows'],
+                actions=options['actions'],
+                admins=options['admins'],
+                repeat=options['repeat'],
+                stdout=self.stdout,
+            )
+        finally:
+            teardown_databases(old_config, verbosity=0)
+            teardown_test_environment()
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                json.dump(results, f, indent=2)
+        if baseline is not None:
+            regressions = compare_benchmarks(baseline, results, options['threshold'])
+            for name, metric, before, after in regressions:
+                self.stderr.write('{}: {} {} -> {}'.format(name, metric, before, after))
+            if regressions:
+                raise CommandError('{} benchmark regression(s) compared to {}'.format(len(regressions), options['compare']))
@@ -0,0 +1,54 @@
+# Python
+from __future__ import unicode_literals
+import json
+import os
+import tempfile
+
+# Django
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.test.utils import setup_databases, setup_test_environment, teardown_databases, teardown_test_environment
+
+# Test App
+from test_project.test_app.load import MODES, SCENARIOS, run_load
+
+
+class Command(BaseCommand):
+
+    help = 'Run concurrent object actions against a test database to measure contention.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=8, help='Number of concurrent admin clients.')
+        parser.add_argument('--requests', type=int, default=20, help='Number of actions run by each client.')
+        parser.add_argument('--modes', nargs='+', choices=list(MODES), default=list(MODES), help='Transaction and locking modes.')
+        parser.add_argument('--scenarios', nargs='+', choices=list(SCENARIOS), default=list(SCENARIOS), help='Run actions on the same or on different objects.')
+        parser.add_argument('--think-time', type=float, default=0.0, help='Seconds spent in each action between reading and saving the object.')
+        parser.add_argument('--output', default=None, help='Write the results as JSON to this file.')
+
+    def handle(self, *args, **options):
+        settings_dict = connections['default'].settings_dict
+        tempdir = None
+        if settings_dict['ENGINE'] == 'django.db.backends.sqlite3':
+            # Use a file instead of the default in-memory test database, so
+            # that each client thread gets its own connection.
+            tempdir = tempfile.mkdtemp()
+            settings_dict.setdefault('TEST', {})['NAME'] = os.path.join(tempdir, 'load.sqlite3')
+        setup_test_environment()
+        old_config = setup_databases(verbosity=0, interactive=False, aliases={'default'})
+        try:
+            results = run_load(
+                threads=options['threads'],
+                requests=options['requests'],
+                modes=options['modes'],
+                scenarios=options['scenarios'],
+                think_time=options['think_time'],
+                stdout=self.stdout,
+            )
+        finally:
+            teardown_databases(old_config, verbosity=0)
+            teardown_test_environment()
+            if tempdir is not None:
+                os.rmdir(tempdir)
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                json.dump(results, f, indent=2)
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('test_app', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='testmodel',
+            name='counter',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+    ]
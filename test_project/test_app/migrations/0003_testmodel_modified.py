@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('test_app', '0002_testmodel_counter'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='testmodel',
+            name='modified',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
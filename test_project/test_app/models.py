@@ -23,6 +23,13 @@ class TestModel(models.Model):
         default=None,
         editable=False,
     )
+    counter = models.IntegerField(
+        default=0,
+        editable=False,
+    )
+    modified = models.DateTimeField(
+        auto_now=True,
+    )
 
     def __str__(self):
         return self.name
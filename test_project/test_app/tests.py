@@ -2,13 +2,20 @@
 
 # Python
 from __future__ import unicode_literals
+import uuid
+
+# py.test
+import pytest
 
 # Django
+import django
 from django.contrib.admin.models import LogEntry
 from django.contrib import messages
+from django.db import DatabaseError
 try:
-    from django.urls import reverse
+    from django.urls import re_path, reverse
 except ImportError:
+    from django.conf.urls import url as re_path
     from django.core.urlresolvers import reverse
 
 
@@ -170,3 +177,1021 @@ def test_object_action_fail(admin_client, test_model_instance):
     assert message_list[0].level == messages.ERROR
     assert 'not failed' in message_list[0].message
     assert LogEntry.objects.count() == 0
+
+
+def test_object_actions_index(test_model):
+    from django.contrib import admin
+    model_admin = admin.site._registry[test_model]
+    index = model_admin.get_object_actions_index()
+    assert list(index) == [x['slug'] for x in model_admin.object_actions]
+    assert model_admin.get_object_actions_index() is index
+    assert model_admin.get_object_action_option('refresh', 'form_method') == 'GET'
+    assert model_admin.get_object_action_option('refresh', 'form_class') is None
+    assert model_admin.get_object_action_option('missing', 'form_method', 'POST') == 'POST'
+
+
+def test_object_actions_index_duplicate_slug(test_model):
+    from django.contrib import admin
+    model_admin = admin.site._registry[test_model]
+    with pytest.raises(AssertionError):
+        model_admin.compile_object_actions([{'slug': 'refresh'}, {'slug': 'refresh'}])
+
+
+def test_object_actions_dynamic_override(test_model):
+    from django.contrib import admin
+    model_admin = admin.site._registry[test_model]
+    dynamic_action = {'slug': 'dynamic', 'verbose_name': 'dynamic action'}
+
+    def get_object_actions(obj=None):
+        return model_admin.__class__.get_object_actions(model_admin, obj) + [dynamic_action]
+
+    model_admin.get_object_actions = get_object_actions
+    try:
+        assert model_admin.get_object_action_option('dynamic', 'verbose_name') == 'dynamic action'
+        assert 'dynamic' not in model_admin.get_object_actions_index()
+    finally:
+        del model_admin.get_object_actions
+
+
+def test_object_action_permission_matrix(admin_client, test_model, monkeypatch):
+    from django.contrib import admin
+    model_admin = admin.site._registry[test_model]
+    for n in range(3):
+        test_model.objects.create(name='test{}'.format(n))
+    permission_checks = []
+
+    def has_object_action_permission(request, obj, action):
+        permission_checks.append((action, obj))
+        return model_admin.__class__.has_object_action_permission(model_admin, request, obj, action)
+
+    monkeypatch.setattr(model_admin, 'has_object_action_permission', has_object_action_permission)
+    changelist_url = reverse('admin:test_app_testmodel_changelist')
+    response = admin_client.get(changelist_url)
+    assert response.status_code == 200
+    assert [x for x in permission_checks if x[0] == 'refresh'] == [('refresh', None)]
+    assert len([x for x in permission_checks if x[0] == 'update']) == 3
+    assert response.content.decode('utf-8').count('/refresh/') == 3
+    # Nothing is computed when the object actions column is not shown.
+    del permission_checks[:]
+    monkeypatch.setattr(model_admin, 'get_list_display', lambda request: ('name', 'enabled'))
+    response = admin_client.get(changelist_url)
+    assert response.status_code == 200
+    assert '/refresh/' not in response.content.decode('utf-8')
+    assert permission_checks == []
+
+
+def test_object_action_display_matches_reverse(rf, admin_user, test_model, test_model_instance):
+    from django.contrib import admin
+    from django.utils.html import format_html
+    model_admin = admin.site._registry[test_model]
+    request = rf.get('/test_app/testmodel/?q=a&b="c"')
+    request.user = admin_user
+    for pk in [test_model_instance.pk, 'a&b/c~d:e%f', "g'h(i)"]:
+        obj = test_model(pk=pk, name='test')
+        href = reverse('admin:test_app_testmodel_refresh', args=[pk])
+        expected = format_html('<a class="button" href="{}?next={}">{}</a>', href, request.get_full_path(), 'Refresh')
+        assert model_admin.get_object_action_display(request, obj, 'refresh') == expected
+
+
+def test_object_action_form_cache(rf, admin_user, test_model, test_model_instance):
+    from django.contrib import admin
+    model_admin = admin.site._registry[test_model]
+    assert model_admin._object_action_form_cache
+    request = rf.get('/')
+    request.user = admin_user
+    form_class = model_admin.get_object_action_form(request, test_model_instance, 'update')
+    assert model_admin.get_object_action_form(request, test_model_instance, 'update') is form_class
+    assert form_class.do_object_action_callable is None
+    form_kwargs = model_admin.get_object_action_form_kwargs(request, test_model_instance, 'update')
+    form = form_class(instance=test_model_instance, **form_kwargs)
+    assert list(form.fields) == ['name']
+    assert form.do_object_action_callable == model_admin.do_update
+    assert 'vTextField' in str(form['name'])
+
+
+def test_object_action_form_class_callable(test_model, test_model_instance):
+    from admin_object_actions.forms import AdminObjectActionForm
+    calls = []
+
+    def do_action(obj, form):
+        calls.append((obj, form))
+        return 'done'
+
+    class ActionForm(AdminObjectActionForm):
+
+        do_object_action_callable = do_action
+
+        class Meta:
+            model = test_model
+            fields = ()
+
+    form = ActionForm({}, instance=test_model_instance)
+    assert form.is_valid()
+    form.save()
+    assert form.object_action_result == 'done'
+    assert calls == [(test_model_instance, form)]
+
+
+def test_object_action_url_dispatcher(admin_client, settings, monkeypatch, test_model, test_model_instance):
+    from django.contrib.admin.sites import AdminSite
+    from test_project.test_app.admin import TestModelAdmin
+    monkeypatch.setattr(TestModelAdmin, 'object_action_url_dispatcher', True)
+    admin_site = AdminSite()
+    admin_site.register(test_model, TestModelAdmin)
+
+    class DispatcherURLConf(object):
+        urlpatterns = [re_path(r'', admin_site.urls)]
+
+    settings.ROOT_URLCONF = DispatcherURLConf
+    url_names = [p.name for p in admin_site._registry[test_model].get_urls()]
+    change_index = url_names.index('test_app_testmodel_change')
+    assert url_names.index('test_app_testmodel_object_action') < change_index
+    assert url_names.index('test_app_testmodel_refresh') > change_index
+    refresh_url = reverse('admin:test_app_testmodel_refresh', args=[test_model_instance.pk])
+    change_url = reverse('admin:test_app_testmodel_change', args=[test_model_instance.pk])
+    assert refresh_url == '/test_app/testmodel/{}/refresh/'.format(test_model_instance.pk)
+    response = admin_client.get(refresh_url)
+    assert response.status_code == 302
+    assert response.resolver_match.url_name == 'test_app_testmodel_object_action'
+    test_model_instance.refresh_from_db()
+    assert test_model_instance.refreshed
+    response = admin_client.get(change_url)
+    assert response.status_code == 200
+    assert response.resolver_match.url_name == 'test_app_testmodel_change'
+    # Async actions are resolved by their own patterns ahead of the dispatcher.
+    ping_url = reverse('admin:test_app_testmodel_ping', args=[test_model_instance.pk])
+    response = admin_client.get(ping_url)
+    assert response.status_code == 302
+    if django.VERSION >= (3, 1):
+        assert response.resolver_match.url_name == 'test_app_testmodel_ping'
+
+
+def test_object_action_bulk(admin_client, monkeypatch, test_model):
+    from django.contrib import admin
+    from admin_object_actions.admin import ModelAdminObjectActionsMixin
+    from test_project.test_app.admin import TestModelAdmin
+    monkeypatch.setattr(TestModelAdmin, 'object_action_bulk_chunk_size', 2)
+    model_admin = admin.site._registry[test_model]
+    chunks = []
+
+    def execute_object_action_chunk(request, pks, action, using=None):
+        chunks.append(pks)
+        return TestModelAdmin.execute_object_action_chunk(model_admin, request, pks, action, using)
+
+    monkeypatch.setattr(model_admin, 'execute_object_action_chunk', execute_object_action_chunk)
+    bulk_views = []
+    permission_batches = []
+
+    def object_action_bulk_view(self, request, queryset, action=None):
+        bulk_views.append(action)
+        return ModelAdminObjectActionsMixin.object_action_bulk_view(self, request, queryset, action)
+
+    def has_object_action_permissions(request, objs, action):
+        permission_batches.append(len(objs))
+        return TestModelAdmin.has_object_action_permissions(model_admin, request, objs, action)
+
+    monkeypatch.setattr(TestModelAdmin, 'object_action_bulk_view', object_action_bulk_view)
+    monkeypatch.setattr(model_admin, 'has_object_action_permissions', has_object_action_permissions)
+    objs = [test_model.objects.create(name='test{}'.format(n)) for n in range(3)]
+    changelist_url = reverse('admin:test_app_testmodel_changelist')
+    response = admin_client.get(changelist_url)
+    assert 'object_action_refresh' in response.content.decode('utf-8')
+    data = {
+        'action': 'object_action_refresh',
+        '_selected_action': [obj.pk for obj in objs],
+    }
+    del permission_batches[:]
+    response = admin_client.post(changelist_url, data, follow=True)
+    assert response.status_code == 200
+    assert chunks == [[objs[0].pk, objs[1].pk], [objs[2].pk]]
+    # Overridden bulk views are used, and permissions are checked per chunk
+    # after the change list has checked the two list actions for the page.
+    assert bulk_views == ['refresh']
+    assert permission_batches[:4] == [3, 3, 2, 1]
+    message_list = list(response.context['messages'])
+    assert len(message_list) == 1
+    assert message_list[0].level == messages.SUCCESS
+    assert 'refreshed 3 test models' in message_list[0].message
+    assert test_model.objects.filter(refreshed__isnull=False).count() == 3
+    assert LogEntry.objects.count() == 3
+    assert all('refreshed' in x.change_message.lower() for x in LogEntry.objects.all())
+
+    data['action'] = 'object_action_update'
+    response = admin_client.post(changelist_url, data, follow=True)
+    message_list = list(response.context['messages'])
+    assert len(message_list) == 1
+    assert message_list[0].level == messages.ERROR
+    assert 'Failed to update 3 test models' in message_list[0].message
+    assert LogEntry.objects.count() == 3
+
+
+def test_object_action_bulk_queryset_function(admin_client, test_model):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+    objs = [test_model.objects.create(name='test{}'.format(n)) for n in range(3)]
+    changelist_url = reverse('admin:test_app_testmodel_changelist')
+    data = {
+        'action': 'object_action_enable',
+        '_selected_action': [obj.pk for obj in objs],
+    }
+    with CaptureQueriesContext(connection) as queries:
+        response = admin_client.post(changelist_url, data)
+    assert response.status_code == 302
+    updates = [q['sql'] for q in queries if q['sql'].startswith('UPDATE') and 'test_app_testmodel' in q['sql']]
+    assert len(updates) == 1
+    inserts = [q['sql'] for q in queries if q['sql'].startswith('INSERT') and 'django_admin_log' in q['sql']]
+    assert len(inserts) == 1
+    assert test_model.objects.filter(enabled=True).count() == 3
+    assert LogEntry.objects.count() == 3
+    assert all('enabled' in x.change_message.lower() for x in LogEntry.objects.all())
+
+
+def test_object_action_background(admin_client, monkeypatch, capture_on_commit_callbacks, test_model_instance):
+    from admin_object_actions.models import ObjectActionTask
+    from test_project.test_app.admin import TestModelAdmin
+    monkeypatch.setattr(TestModelAdmin, 'object_action_executor', 'admin_object_actions.executors.ImmediateObjectActionExecutor')
+    sync_url = reverse('admin:test_app_testmodel_sync', args=[test_model_instance.pk])
+    with capture_on_commit_callbacks() as callbacks:
+        response = admin_client.get(sync_url)
+    assert response.status_code == 302
+    task = ObjectActionTask.objects.get()
+    assert response['Location'] == reverse('admin:test_app_testmodel_object_action_task', args=[task.pk])
+    assert task.status == ObjectActionTask.STATUS_QUEUED
+    assert not test_model_instance.refreshed
+    response = admin_client.get(response['Location'])
+    assert response.status_code == 200
+    assert 'http-equiv="refresh"' in response.content.decode('utf-8')
+    assert len(callbacks) == 1
+    callbacks[0]()
+    task.refresh_from_db()
+    assert task.status == ObjectActionTask.STATUS_DONE
+    assert task.result.startswith('synced at ')
+    test_model_instance.refresh_from_db()
+    assert test_model_instance.refreshed
+    assert LogEntry.objects.count() == 1
+    response = admin_client.get(reverse('admin:test_app_testmodel_object_action_task', args=[task.pk]))
+    assert task.result in response.content.decode('utf-8')
+    assert 'http-equiv="refresh"' not in response.content.decode('utf-8')
+
+
+def test_object_action_database_executor(admin_client, monkeypatch, test_model_instance):
+    from django.core.management import call_command
+    from admin_object_actions.models import ObjectActionTask
+    from test_project.test_app.admin import TestModelAdmin
+    monkeypatch.setattr(TestModelAdmin, 'object_action_executor', 'admin_object_actions.executors.DatabaseObjectActionExecutor')
+    sync_url = reverse('admin:test_app_testmodel_sync', args=[test_model_instance.pk])
+    admin_client.get(sync_url)
+    admin_client.get(sync_url)
+    assert ObjectActionTask.objects.filter(status=ObjectActionTask.STATUS_QUEUED).count() == 2
+    test_model_instance.delete()
+    call_command('run_object_action_tasks', once=True)
+    assert ObjectActionTask.objects.filter(status=ObjectActionTask.STATUS_FAILED).count() == 2
+
+
+@pytest.mark.skipif(django.VERSION < (3, 1), reason='async views require Django 3.1')
+def test_object_action_async(admin_client, monkeypatch, test_model_instance):
+    from inspect import iscoroutinefunction
+    from django.urls import resolve
+    changelist_url = reverse('admin:test_app_testmodel_changelist')
+    ping_url = reverse('admin:test_app_testmodel_ping', args=[test_model_instance.pk])
+    refresh_url = reverse('admin:test_app_testmodel_refresh', args=[test_model_instance.pk])
+    assert iscoroutinefunction(resolve(ping_url).func)
+    assert not iscoroutinefunction(resolve(refresh_url).func)
+    response = admin_client.get(ping_url, follow=True)
+    assert response.status_code == 200
+    assert response.redirect_chain[0][0] == changelist_url
+    message_list = list(response.context['messages'])
+    assert message_list[0].level == messages.SUCCESS
+    assert 'pinged' in message_list[0].message
+    assert LogEntry.objects.count() == 1
+    assert 'pinged' in LogEntry.objects.first().change_message.lower()
+    # Overrides of save_form() are used for async actions.
+    from test_project.test_app.admin import TestModelAdmin
+    saved_forms = []
+
+    def save_form(self, request, form, change):
+        saved_forms.append(form)
+        return super(TestModelAdmin, self).save_form(request, form, change)
+
+    monkeypatch.setattr(TestModelAdmin, 'save_form', save_form, raising=False)
+    response = admin_client.get(ping_url)
+    assert response.status_code == 302
+    assert len(saved_forms) == 1
+    assert saved_forms[0].object_action_result == 'pong'
+    admin_client.logout()
+    response = admin_client.get(ping_url)
+    assert response.status_code == 302
+    assert reverse('admin:login') in response['Location']
+
+
+def test_object_action_async_sync_fallback(rf, admin_user, monkeypatch, test_model_instance):
+    import admin_object_actions.forms
+    from django.contrib import admin
+    # Without asgiref, async action functions are run in a new event loop.
+    monkeypatch.setattr(admin_object_actions.forms, 'async_to_sync', None)
+    model_admin = admin.site._registry[test_model_instance.__class__]
+    request = rf.get('/')
+    request.user = admin_user
+    form_class = model_admin.get_object_action_form(request, test_model_instance, 'ping')
+    form = form_class({}, instance=test_model_instance, **model_admin.get_object_action_form_kwargs(request, test_model_instance, 'ping'))
+    assert form.is_valid()
+    form.save(commit=False)
+    assert form.object_action_result == 'pong'
+
+
+def test_object_action_lock(admin_client, monkeypatch, test_model, test_model_instance):
+    from django.contrib import admin
+    from django.db import transaction
+    model_admin = admin.site._registry[test_model]
+    update_url = reverse('admin:test_app_testmodel_update', args=[test_model_instance.pk])
+    disable_url = reverse('admin:test_app_testmodel_disable', args=[test_model_instance.pk])
+    querysets = []
+    atomic_blocks = []
+
+    def get_object_from_queryset(queryset, object_id):
+        querysets.append(queryset)
+        return model_admin.__class__.get_object_from_queryset(model_admin, queryset, object_id)
+
+    def get_object_action_atomic(request, action, scope):
+        atomic = model_admin.__class__.get_object_action_atomic(model_admin, request, action, scope)
+        atomic_blocks.append((scope, isinstance(atomic, transaction.Atomic)))
+        return atomic
+
+    monkeypatch.setattr(model_admin, 'get_object_from_queryset', get_object_from_queryset)
+    monkeypatch.setattr(model_admin, 'get_object_action_atomic', get_object_action_atomic)
+    response = admin_client.get(update_url)
+    assert response.status_code == 200
+    assert not querysets[0].query.select_for_update
+    response = admin_client.post(update_url, {'name': 'locked'})
+    assert response.status_code == 302
+    assert [x for x in atomic_blocks if x[0] == 'execute'] == [('execute', False), ('execute', True)]
+    assert querysets[1].query.select_for_update
+    assert not querysets[1].query.select_for_update_nowait
+    response = admin_client.post(disable_url, {'confirm': 'on'})
+    assert querysets[2].query.select_for_update_nowait
+
+    def get_locked_object(queryset, object_id):
+        if queryset.query.select_for_update:
+            raise DatabaseError('could not obtain lock')
+        return model_admin.__class__.get_object_from_queryset(model_admin, queryset, object_id)
+
+    monkeypatch.setattr(model_admin, 'get_object_from_queryset', get_locked_object)
+    response = admin_client.post(update_url, {'name': 'unlocked'}, follow=True)
+    message_list = list(response.context['messages'])
+    assert message_list[-1].level == messages.ERROR
+    assert 'locked by another action' in message_list[-1].message
+    test_model_instance.refresh_from_db()
+    assert test_model_instance.name == 'locked'
+
+
+def test_object_action_read_database(admin_client, settings, monkeypatch, test_model, test_model_instance):
+    from django.contrib import admin
+    from django.db import connections, transaction
+    # Share the default connection, since the test transaction on the default
+    # database would otherwise lock the mirrored SQLite replica. The connection
+    # is restored before the test database teardown inspects it.
+    with monkeypatch.context() as m:
+        m.setattr(connections._connections, 'replica', connections['default'], raising=False)
+        settings.DATABASE_ROUTERS = ['test_project.test_app.routers.ReplicaRouter']
+        model_admin = admin.site._registry[test_model]
+        update_url = reverse('admin:test_app_testmodel_update', args=[test_model_instance.pk])
+        querysets = []
+        atomic_blocks = []
+
+        def get_object_from_queryset(queryset, object_id):
+            querysets.append(queryset)
+            return model_admin.__class__.get_object_from_queryset(model_admin, queryset, object_id)
+
+        def get_object_action_atomic(request, action, scope):
+            atomic = model_admin.__class__.get_object_action_atomic(model_admin, request, action, scope)
+            atomic_blocks.append(isinstance(atomic, transaction.Atomic))
+            return atomic
+
+        monkeypatch.setattr(model_admin, 'get_object_from_queryset', get_object_from_queryset)
+        monkeypatch.setattr(model_admin, 'get_object_action_atomic', get_object_action_atomic)
+        response = admin_client.get(update_url)
+        assert response.status_code == 200
+        assert querysets[0].db == 'replica'
+        assert not any(atomic_blocks)
+        response = admin_client.post(update_url, {'name': 'replicated'})
+        assert response.status_code == 302
+        assert querysets[1].db == 'default'
+        assert querysets[1].query.select_for_update
+        assert test_model.objects.using('default').get(pk=test_model_instance.pk).name == 'replicated'
+
+
+@pytest.mark.django_db(databases=['default', 'other'])
+def test_object_action_using(admin_client, admin_user, monkeypatch, test_model):
+    from django.contrib import admin
+    model_admin = admin.site._registry[test_model]
+    admin_user.save(using='other')
+    obj = test_model.objects.using('other').create(name='other')
+    monkeypatch.setattr(model_admin, 'get_object_action_using', lambda request, obj, action: 'other')
+    refresh_url = reverse('admin:test_app_testmodel_refresh', args=[obj.pk])
+    response = admin_client.get(refresh_url)
+    assert response.status_code == 302
+    assert test_model.objects.using('other').get(pk=obj.pk).refreshed
+    assert not LogEntry.objects.using('default').exists()
+    log_entry = LogEntry.objects.using('other').get()
+    assert log_entry.object_id == str(obj.pk)
+    assert 'refreshed' in log_entry.change_message.lower()
+
+
+def test_object_action_history(admin_client, capture_on_commit_callbacks, django_assert_num_queries, test_model):
+    from admin_object_actions.models import ObjectActionLog
+    objs = [test_model.objects.create(name='test{}'.format(n)) for n in range(3)]
+    refresh_url = reverse('admin:test_app_testmodel_refresh', args=[objs[0].pk])
+    with capture_on_commit_callbacks() as callbacks:
+        response = admin_client.get(refresh_url)
+    assert response.status_code == 302
+    assert not ObjectActionLog.objects.exists()
+    with django_assert_num_queries(1):
+        for callback in callbacks:
+            callback()
+    log = ObjectActionLog.objects.get()
+    assert log.object_id == str(objs[0].pk)
+    assert log.slug == 'refresh'
+    assert log.is_success
+    assert log.duration is not None
+    changelist_url = reverse('admin:test_app_testmodel_changelist')
+    data = {
+        'action': 'object_action_refresh',
+        '_selected_action': [obj.pk for obj in objs],
+    }
+    with capture_on_commit_callbacks(execute=True) as callbacks:
+        response = admin_client.post(changelist_url, data)
+    assert response.status_code == 302
+    # History for a bulk chunk is inserted at once after the commit.
+    assert len(callbacks) == 1
+    assert ObjectActionLog.objects.filter(slug='refresh').count() == 4
+    history_url = reverse('admin:test_app_testmodel_object_action_history', args=[objs[0].pk])
+    response = admin_client.get(history_url)
+    assert response.status_code == 200
+    assert len(response.context['object_action_history']) == 2
+    response = admin_client.get(history_url, {'action': 'enable'})
+    assert response.status_code == 200
+    assert not response.context['object_action_history']
+
+
+@pytest.mark.skipif(django.VERSION < (2, 1), reason='QuerySet.explain() requires Django 2.1')
+def test_object_action_history_indexes(rf, admin_user, test_model_instance):
+    from django.contrib import admin
+    from django.db import connection
+    if connection.vendor != 'sqlite':
+        pytest.skip('query plans are checked on SQLite')
+    model_admin = admin.site._registry[test_model_instance.__class__]
+    request = rf.get('/')
+    request.user = admin_user
+    queryset = model_admin.get_object_action_history_queryset(request, test_model_instance)
+    # The history page is served by an index, without sorting.
+    for index_name, history in [
+        ('object_action_log_object_idx', queryset),
+        ('object_action_log_action_idx', queryset.filter(slug='refresh')),
+    ]:
+        plan = history.order_by('-timestamp').explain()
+        assert index_name in plan
+        assert 'TEMP B-TREE' not in plan
+
+
+def test_object_action_metrics(admin_client, test_model_instance):
+    from django.contrib import admin
+    model_admin = admin.site._registry[test_model_instance.__class__]
+    metrics = model_admin.get_object_action_metrics()
+    metrics.reset()
+    update_url = reverse('admin:test_app_testmodel_update', args=[test_model_instance.pk])
+    response = admin_client.get(update_url)
+    assert response.status_code == 200
+    response = admin_client.post(update_url, {'name': 'measured'})
+    assert response.status_code == 302
+    stats = dict(((stat['model'], stat['action']), stat) for stat in metrics.get_stats())
+    stat = stats[('test_app.testmodel', 'update')]
+    assert stat['count'] == 1
+    assert stat['failures'] == 0
+    assert list(stat['phases']) == ['fetch', 'permission', 'form', 'validate', 'execute', 'log', 'render']
+    assert stat['phases']['fetch']['count'] == 2
+    assert stat['phases']['permission']['count'] == 2
+    assert stat['phases']['render']['count'] == 1
+    assert 0 <= stat['phases']['execute']['p50'] <= stat['phases']['execute']['p99']
+    response = admin_client.get(reverse('admin:test_app_testmodel_object_action_metrics'))
+    assert response.status_code == 200
+    assert 'p95' in response.content.decode('utf-8')
+    assert [x['action'] for x in response.context['object_action_metrics']] == ['update']
+
+
+def test_object_action_metrics_histogram():
+    from admin_object_actions.metrics import ObjectActionHistogram
+    histogram = ObjectActionHistogram()
+    assert histogram.percentile(0.5) is None
+    for n in range(100):
+        histogram.observe((n + 1) / 1000.0)
+    assert histogram.percentile(0.5) == pytest.approx(0.05, rel=0.2)
+    assert histogram.percentile(0.99) == pytest.approx(0.099, rel=0.2)
+    assert histogram.percentile(1.0) == 0.1
+
+
+def test_object_action_server_timing(admin_client, monkeypatch, test_model_instance):
+    from test_project.test_app.admin import TestModelAdmin
+    update_url = reverse('admin:test_app_testmodel_update', args=[test_model_instance.pk])
+    changelist_url = reverse('admin:test_app_testmodel_changelist')
+    response = admin_client.get(update_url)
+    assert not response.has_header('Server-Timing')
+    monkeypatch.setattr(TestModelAdmin, 'object_action_server_timing', True)
+    response = admin_client.get(update_url)
+    assert response.status_code == 200
+    phases = [x.split(';')[0] for x in response['Server-Timing'].split(', ')]
+    assert phases == ['fetch', 'permission', 'form', 'render']
+    assert 'desc="get_object";dur=' in response['Server-Timing']
+    response = admin_client.post(update_url, {'name': 'timed'})
+    assert response.status_code == 302
+    phases = [x.split(';')[0] for x in response['Server-Timing'].split(', ')]
+    assert phases == ['fetch', 'permission', 'form', 'validate', 'execute', 'log']
+    response = admin_client.get(changelist_url)
+    assert response.status_code == 200
+    phases = [x.split(';')[0] for x in response['Server-Timing'].split(', ')]
+    assert phases == ['permission', 'column', 'render']
+
+
+def test_benchmark_object_actions(admin_user, db):
+    from test_project.test_app.benchmarks import compare_benchmarks, run_benchmarks
+    results = run_benchmarks(rows=[3], actions=[1, 2], admins=[2], repeat=1)
+    assert list(results['scenarios']) == [
+        'changelist[rows=3,actions=1]',
+        'changelist[rows=3,actions=2]',
+        'action_form_get[actions=1]',
+        'action_form_post[actions=1]',
+        'action_form_get[actions=2]',
+        'action_form_post[actions=2]',
+        'action_function_get[actions=2]',
+        'get_urls[admins=2,actions=1,dispatcher=0]',
+        'get_urls[admins=2,actions=1,dispatcher=1]',
+        'get_urls[admins=2,actions=2,dispatcher=0]',
+        'get_urls[admins=2,actions=2,dispatcher=1]',
+    ]
+    assert results['scenarios']['get_urls[admins=2,actions=1,dispatcher=0]']['queries'] == 0
+    assert compare_benchmarks(results, results) == []
+    baseline = {'scenarios': {'changelist[rows=3,actions=1]': {'median': 0.0, 'queries': 0}}}
+    regressions = compare_benchmarks(baseline, results)
+    assert [x[:2] for x in regressions] == [('changelist[rows=3,actions=1]', 'median'), ('changelist[rows=3,actions=1]', 'queries')]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_load_object_actions(admin_user):
+    from test_project.test_app.load import run_load
+    results = run_load(threads=1, requests=3, modes=['view', 'lock'], scenarios=['same'])
+    assert [(x['mode'], x['scenario']) for x in results['results']] == [('view', 'same'), ('lock', 'same')]
+    for result in results['results']:
+        assert result['requests'] == 3
+        assert result['successes'] == 3
+        assert result['errors'] == 0
+        assert result['lost_updates'] == 0
+        assert result['p99'] >= result['p50'] > 0
+
+
+def test_object_action_query_budget(admin_client, monkeypatch, test_model_instance):
+    from django.contrib import admin
+    from admin_object_actions.exceptions import ObjectActionQueryBudgetExceeded, ObjectActionQueryBudgetWarning
+    from test_project.test_app.admin import TestModelAdmin
+    model_admin = admin.site._registry[test_model_instance.__class__]
+    refresh_url = reverse('admin:test_app_testmodel_refresh', args=[test_model_instance.pk])
+    changelist_url = reverse('admin:test_app_testmodel_changelist')
+    response = admin_client.get(refresh_url)
+    assert response.status_code == 302
+    response = admin_client.get(changelist_url)
+    assert response.status_code == 200
+
+    def get_object_action_option(action, option, default=None):
+        if option == 'max_queries':
+            return 1
+        return TestModelAdmin.get_object_action_option(model_admin, action, option, default)
+
+    monkeypatch.setattr(model_admin, 'get_object_action_option', get_object_action_option)
+    test_model_instance.refresh_from_db()
+    refreshed = test_model_instance.refreshed
+    with pytest.raises(ObjectActionQueryBudgetExceeded) as excinfo:
+        admin_client.get(refresh_url)
+    assert 'Object action "refresh" of test_app.testmodel' in str(excinfo.value)
+    assert '[fetch] SELECT' in str(excinfo.value)
+    # The changes of the action are rolled back.
+    test_model_instance.refresh_from_db()
+    assert test_model_instance.refreshed == refreshed
+    monkeypatch.setattr(TestModelAdmin, 'object_action_query_budget_mode', 'warn')
+    with pytest.warns(ObjectActionQueryBudgetWarning):
+        response = admin_client.get(refresh_url)
+    assert response.status_code == 302
+    test_model_instance.refresh_from_db()
+    assert test_model_instance.refreshed > refreshed
+    # Budgets are only checked in DEBUG mode by default.
+    monkeypatch.setattr(TestModelAdmin, 'object_action_query_budget_mode', 'raise')
+    monkeypatch.setitem(model_admin.__dict__, 'object_action_query_budgets', None)
+    response = admin_client.get(refresh_url)
+    assert response.status_code == 302
+    monkeypatch.undo()
+
+    def has_object_action_permission(request, obj, action):
+        return test_model_instance.__class__.objects.exists()
+
+    monkeypatch.setattr(model_admin, 'has_object_action_permission', has_object_action_permission)
+    with pytest.raises(ObjectActionQueryBudgetExceeded) as excinfo:
+        admin_client.get(changelist_url)
+    assert '[permission] SELECT' in str(excinfo.value)
+
+
+def test_object_action_queryset(admin_client, monkeypatch, test_model_instance):
+    from django.contrib import admin
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+    from test_project.test_app.admin import TestModelAdmin
+    model_admin = admin.site._registry[test_model_instance.__class__]
+    refresh_url = reverse('admin:test_app_testmodel_refresh', args=[test_model_instance.pk])
+    with CaptureQueriesContext(connection) as queries:
+        response = admin_client.get(refresh_url)
+    assert response.status_code == 302
+    selects = [q['sql'] for q in queries if q['sql'].startswith('SELECT') and 'test_app_testmodel' in q['sql']]
+    assert '"refreshed"' in selects[0]
+    assert '"enabled"' not in selects[0]
+    assert len(selects) == 1
+    test_model_instance.refresh_from_db()
+    assert test_model_instance.refreshed
+    querysets = []
+
+    def get_object_action_option(action, option, default=None):
+        if option == 'queryset':
+            return lambda request, queryset: querysets.append(queryset) or queryset.none()
+        return TestModelAdmin.get_object_action_option(model_admin, action, option, default)
+
+    monkeypatch.setattr(model_admin, 'get_object_action_option', get_object_action_option)
+    response = admin_client.get(refresh_url)
+    assert response.status_code == 302
+    assert response['Location'] == reverse('admin:index')
+    assert len(querysets) == 1
+
+
+def test_object_action_fragment_cache(admin_client, monkeypatch, capture_on_commit_callbacks, test_model_instance):
+    from django.contrib import admin
+    from test_project.test_app.admin import TestModelAdmin
+    model_admin = admin.site._registry[test_model_instance.__class__]
+    monkeypatch.setattr(TestModelAdmin, 'object_action_fragment_cache', True)
+    monkeypatch.delitem(model_admin.__dict__, '_object_action_fragment_cache', raising=False)
+    displays = []
+
+    def get_object_action_display(request, obj, action):
+        displays.append((obj.pk, action))
+        return TestModelAdmin.get_object_action_display(model_admin, request, obj, action)
+
+    monkeypatch.setattr(model_admin, 'get_object_action_display', get_object_action_display)
+    changelist_url = reverse('admin:test_app_testmodel_changelist')
+    refresh_url = reverse('admin:test_app_testmodel_refresh', args=[test_model_instance.pk])
+    response = admin_client.get(changelist_url)
+    assert response.status_code == 200
+    assert refresh_url in response.content.decode('utf-8')
+    assert len(displays) == 2
+    response = admin_client.get(changelist_url)
+    assert refresh_url in response.content.decode('utf-8')
+    assert len(displays) == 2
+    # A different next URL is cached separately.
+    response = admin_client.get(changelist_url, {'o': '1'})
+    assert len(displays) == 4
+    with capture_on_commit_callbacks(execute=True):
+        response = admin_client.get(refresh_url)
+    assert response.status_code == 302
+    response = admin_client.get(changelist_url)
+    assert refresh_url in response.content.decode('utf-8')
+    assert len(displays) == 6
+
+
+def test_object_action_spec_version(monkeypatch, test_model):
+    from django.contrib import admin
+    from django.utils.translation import gettext_lazy
+    model_admin = admin.site._registry[test_model]
+    version = model_admin.get_object_action_spec_version()
+    assert version == model_admin.get_object_action_spec_version()
+    # Lazy labels are part of the version.
+    object_actions = [dict(object_action) for object_action in model_admin.object_actions]
+    object_actions[0]['verbose_name'] = gettext_lazy('switch on')
+    monkeypatch.setitem(model_admin.__dict__, 'object_actions', object_actions)
+    changed_version = model_admin.get_object_action_spec_version()
+    assert changed_version != version
+    object_actions = [dict(object_action) for object_action in object_actions]
+    object_actions[0]['verbose_name'] = gettext_lazy('turn on')
+    monkeypatch.setitem(model_admin.__dict__, 'object_actions', object_actions)
+    assert model_admin.get_object_action_spec_version() not in (version, changed_version)
+
+
+def test_object_action_bound_admin(admin_client, monkeypatch, test_model_instance):
+    import admin_object_actions.admin
+    monkeypatch.setattr(admin_object_actions.admin, 'get_current_request', lambda: None)
+    refresh_url = reverse('admin:test_app_testmodel_refresh', args=[test_model_instance.pk])
+    response = admin_client.get(reverse('admin:test_app_testmodel_changelist'))
+    assert response.status_code == 200
+    assert refresh_url in response.content.decode('utf-8')
+    change_url = reverse('admin:test_app_testmodel_change', args=[test_model_instance.pk])
+    response = admin_client.get(change_url)
+    assert response.status_code == 200
+    assert reverse('admin:test_app_testmodel_update', args=[test_model_instance.pk]) in response.content.decode('utf-8')
+    response = admin_client.get(reverse('admin:test_app_testmodel_update', args=[test_model_instance.pk]))
+    assert response.status_code == 200
+    # Outside of the admin views, the current request cannot be looked up.
+    from django.contrib import admin
+    model_admin = admin.site._registry[test_model_instance.__class__]
+    assert model_admin.display_object_actions_list(test_model_instance) == model_admin.get_empty_value_display()
+
+
+def test_object_action_condition(admin_client, monkeypatch, test_model):
+    from django.contrib import admin
+    from django.db.models import Q
+    from test_project.test_app.admin import TestModelAdmin
+    enabled_instance = test_model.objects.create(name='enabled', enabled=True)
+    disabled_instance = test_model.objects.create(name='disabled', enabled=False)
+    model_admin = admin.site._registry[test_model]
+    object_actions = [
+        dict(object_action, condition=Q(enabled=True)) if object_action['slug'] == 'refresh' else object_action
+        for object_action in TestModelAdmin.object_actions
+    ]
+    monkeypatch.setattr(TestModelAdmin, 'object_actions', object_actions)
+    # The conditions of all rows are evaluated in a single query.
+    monkeypatch.setattr(model_admin, 'object_action_column_max_queries', 1)
+    enabled_url = reverse('admin:test_app_testmodel_refresh', args=[enabled_instance.pk])
+    disabled_url = reverse('admin:test_app_testmodel_refresh', args=[disabled_instance.pk])
+    response = admin_client.get(reverse('admin:test_app_testmodel_changelist'))
+    assert response.status_code == 200
+    assert enabled_url in response.content.decode('utf-8')
+    assert disabled_url not in response.content.decode('utf-8')
+    response = admin_client.get(disabled_url)
+    assert response.status_code == 403
+    disabled_instance.refresh_from_db()
+    assert not disabled_instance.refreshed
+    response = admin_client.get(enabled_url)
+    assert response.status_code == 302
+    enabled_instance.refresh_from_db()
+    assert enabled_instance.refreshed
+    request = response.wsgi_request
+    conditions = model_admin.get_object_action_conditions(request, [enabled_instance, disabled_instance], ['refresh', 'update'])
+    assert conditions == {('refresh', enabled_instance.pk): True, ('refresh', disabled_instance.pk): False}
+
+
+def test_object_action_coalesce_saves(admin_client, monkeypatch, test_model_instance):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+    from django.utils.timezone import now
+    from test_project.test_app.admin import TestModelAdmin
+
+    def do_touch(obj, form):
+        obj.refreshed = now()
+        obj.save(update_fields=['refreshed'])
+        obj.name = 'touched'
+        obj.save()
+        obj.save(update_fields=['refreshed'])
+
+    object_actions = [
+        dict(object_action, function=do_touch, coalesce_saves=True) if object_action['slug'] == 'refresh' else object_action
+        for object_action in TestModelAdmin.object_actions
+    ]
+    monkeypatch.setattr(TestModelAdmin, 'object_actions', object_actions)
+    refresh_url = reverse('admin:test_app_testmodel_refresh', args=[test_model_instance.pk])
+    modified = test_model_instance.modified
+    with CaptureQueriesContext(connection) as queries:
+        response = admin_client.get(refresh_url)
+    assert response.status_code == 302
+    updates = [q['sql'] for q in queries.captured_queries if q['sql'].startswith('UPDATE') and 'test_app_testmodel' in q['sql']]
+    assert len(updates) == 1
+    assert '"name"' in updates[0] and '"refreshed"' in updates[0]
+    assert '"enabled"' not in updates[0]
+    test_model_instance.refresh_from_db()
+    assert test_model_instance.name == 'touched'
+    assert test_model_instance.refreshed
+    # auto_now fields are updated along with the modified fields.
+    assert test_model_instance.modified > modified
+
+
+def test_object_action_steps(admin_client, test_model_instance):
+    from django.contrib.admin.models import LogEntry
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+    test_model_instance.enabled = True
+    test_model_instance.save(update_fields=['enabled'])
+    reset_url = reverse('admin:test_app_testmodel_reset', args=[test_model_instance.pk])
+    response = admin_client.get(reset_url)
+    assert response.status_code == 200
+    form = response.context['adminform'].form
+    assert list(form.fields) == ['confirm', 'name']
+    assert form['name'].value() == test_model_instance.name
+    assert 'vTextField' in str(form['name'])
+    assert list(response.context['adminform'].readonly_fields) == ['enabled']
+    response = admin_client.post(reset_url, {'name': 'reset'})
+    assert response.status_code == 200
+    assert 'confirm' in response.context['adminform'].form.errors
+    test_model_instance.refresh_from_db()
+    assert test_model_instance.enabled
+    with CaptureQueriesContext(connection) as queries:
+        response = admin_client.post(reset_url, {'confirm': 'on', 'name': 'reset'})
+    assert response.status_code == 302
+    # The object is fetched once for all steps, and the unique name is only
+    # validated by the form of the update step.
+    selects = [q['sql'] for q in queries.captured_queries if q['sql'].startswith('SELECT') and 'FROM "test_app_testmodel"' in q['sql']]
+    assert len(selects) == 2
+    response = admin_client.get(response['Location'])
+    message_list = list(response.context['messages'])
+    assert len(message_list) == 1
+    assert 'disabled, refreshed and updated successfully' in message_list[0].message
+    test_model_instance.refresh_from_db()
+    assert not test_model_instance.enabled
+    assert test_model_instance.refreshed
+    assert test_model_instance.name == 'reset'
+    assert LogEntry.objects.count() == 1
+    assert LogEntry.objects.get().get_change_message() == 'Disabled, refreshed and updated.'
+
+
+def test_object_action_idempotency(admin_client, monkeypatch, test_model_instance):
+    from test_project.test_app.admin import TestModelAdmin
+    update_url = reverse('admin:test_app_testmodel_update', args=[test_model_instance.pk])
+    response = admin_client.get(update_url)
+    assert response.status_code == 200
+    token = response.context['object_action_token']
+    assert 'name="_object_action_token" value="{}"'.format(token) in response.content.decode('utf-8')
+    response = admin_client.post(update_url, {'name': 'once', '_object_action_token': token}, follow=True)
+    assert response.status_code == 200
+    assert len(list(response.context['messages'])) == 1
+    # A repeated submission replays the original outcome.
+    test_model_instance.refresh_from_db()
+    test_model_instance.name = 'original'
+    test_model_instance.save(update_fields=['name'])
+    response = admin_client.post(update_url, {'name': 'twice', '_object_action_token': token}, follow=True)
+    assert response.status_code == 200
+    message_list = list(response.context['messages'])
+    assert len(message_list) == 1
+    assert 'updated successfully' in message_list[0].message
+    test_model_instance.refresh_from_db()
+    assert test_model_instance.name == 'original'
+    assert LogEntry.objects.count() == 1
+    # GET actions carry the token in their links.
+    object_actions = [
+        dict(object_action, idempotency=True) if object_action['slug'] == 'refresh' else object_action
+        for object_action in TestModelAdmin.object_actions
+    ]
+    monkeypatch.setattr(TestModelAdmin, 'object_actions', object_actions)
+    refresh_url = reverse('admin:test_app_testmodel_refresh', args=[test_model_instance.pk])
+    response = admin_client.get(reverse('admin:test_app_testmodel_changelist'))
+    assert '{}?next='.format(refresh_url) in response.content.decode('utf-8')
+    assert '_object_action_token=' in response.content.decode('utf-8')
+    token = uuid.uuid4().hex
+    for n in range(2):
+        response = admin_client.get(refresh_url, {'_object_action_token': token})
+        assert response.status_code == 302
+    assert LogEntry.objects.count() == 2
+
+
+def test_object_action_form_class_meta(admin_client, monkeypatch, test_model_instance):
+    from django import forms
+    from admin_object_actions.forms import AdminObjectActionForm
+    from test_project.test_app.admin import TestModelAdmin
+
+    class CustomObjectActionForm(AdminObjectActionForm):
+
+        class Meta:
+            widgets = {'name': forms.Textarea}
+            labels = {'name': 'Custom name'}
+            help_texts = {'name': 'Custom help'}
+
+    monkeypatch.setattr(TestModelAdmin, 'object_action_form_class', CustomObjectActionForm)
+    response = admin_client.get(reverse('admin:test_app_testmodel_update', args=[test_model_instance.pk]))
+    assert response.status_code == 200
+    field = response.context['adminform'].form.fields['name']
+    assert isinstance(field.widget, forms.Textarea)
+    assert field.label == 'Custom name'
+    assert field.help_text == 'Custom help'
+
+
+class LogEntryRouter(object):
+
+    def db_for_write(self, model, **hints):
+        if model is LogEntry:
+            return 'other'
+        return None
+
+
+@pytest.mark.django_db(databases=['default', 'other'])
+def test_object_action_using_router(admin_client, admin_user, rf, settings, monkeypatch, test_model):
+    from django.contrib import admin
+    model_admin = admin.site._registry[test_model]
+    settings.DATABASE_ROUTERS = [LogEntryRouter()]
+    admin_user.save(using='other')
+    obj = test_model.objects.create(name='default')
+    log_changes = []
+
+    def log_change(request, obj, message):
+        log_changes.append(obj)
+        return type(model_admin).log_change(model_admin, request, obj, message)
+
+    monkeypatch.setattr(model_admin, 'log_change', log_change)
+    # Objects on the model's database are logged by log_change(), which writes
+    # on the database of log entries.
+    response = admin_client.get(reverse('admin:test_app_testmodel_refresh', args=[obj.pk]))
+    assert response.status_code == 302
+    assert log_changes == [obj]
+    assert not LogEntry.objects.using('default').exists()
+    assert LogEntry.objects.using('other').get().object_id == str(obj.pk)
+    # Other objects are logged on their own database.
+    settings.DATABASE_ROUTERS = []
+    other_obj = test_model.objects.using('other').create(name='other')
+    request = rf.get('/')
+    request.user = admin_user
+    model_admin.log_object_action(request, other_obj, 'Refreshed.', 'refresh')
+    assert log_changes == [obj]
+    assert LogEntry.objects.using('other').filter(object_id=str(other_obj.pk)).exists()
+    assert not LogEntry.objects.using('default').exists()
+
+
+def test_object_action_idempotency_unavailable_cache(admin_client, monkeypatch, test_model_instance):
+    from django.contrib import admin
+    from test_project.test_app.admin import TestModelAdmin
+    model_admin = admin.site._registry[test_model_instance.__class__]
+
+    class UnavailableCache(object):
+
+        def add(self, key, value, timeout=None):
+            return False
+
+        def get(self, key, default=None):
+            return default
+
+    monkeypatch.setattr(model_admin, 'get_object_action_idempotency_cache', lambda: UnavailableCache())
+    monkeypatch.setattr(model_admin, 'object_action_idempotency_wait', 0.2)
+    update_url = reverse('admin:test_app_testmodel_update', args=[test_model_instance.pk])
+    response = admin_client.post(update_url, {'name': 'unavailable', '_object_action_token': uuid.uuid4().hex}, follow=True)
+    assert response.status_code == 200
+    message_list = list(response.context['messages'])
+    assert message_list[0].level == messages.WARNING
+    test_model_instance.refresh_from_db()
+    assert test_model_instance.name != 'unavailable'
+    # Async actions do not check tokens, so none are rendered for them.
+    object_actions = [
+        dict(object_action, idempotency=True) if object_action['slug'] in ('ping', 'refresh') else object_action
+        for object_action in TestModelAdmin.object_actions
+    ]
+    monkeypatch.setattr(TestModelAdmin, 'object_actions', object_actions)
+    assert model_admin.has_object_action_token('refresh')
+    assert not model_admin.has_object_action_token('ping')
+
+
+def test_object_action_condition_annotation(admin_client, monkeypatch, test_model):
+    from django.contrib import admin
+    from django.db.models import Q
+    from django.db.models.functions import Length
+    from test_project.test_app.admin import TestModelAdmin
+    long_instance = test_model.objects.create(name='long name')
+    short_instance = test_model.objects.create(name='short')
+
+    def get_queryset(self, request):
+        return super(TestModelAdmin, self).get_queryset(request).annotate(name_length=Length('name'))
+
+    object_actions = [
+        dict(object_action, condition=Q(name_length__gt=5)) if object_action['slug'] == 'refresh' else object_action
+        for object_action in TestModelAdmin.object_actions
+    ]
+    monkeypatch.setattr(TestModelAdmin, 'get_queryset', get_queryset)
+    monkeypatch.setattr(TestModelAdmin, 'object_actions', object_actions)
+    monkeypatch.setattr(admin.site._registry[test_model], 'object_action_column_max_queries', 1)
+    long_url = reverse('admin:test_app_testmodel_refresh', args=[long_instance.pk])
+    short_url = reverse('admin:test_app_testmodel_refresh', args=[short_instance.pk])
+    response = admin_client.get(reverse('admin:test_app_testmodel_changelist'))
+    assert response.status_code == 200
+    assert long_url in response.content.decode('utf-8')
+    assert short_url not in response.content.decode('utf-8')
+    assert admin_client.get(short_url).status_code == 403
+    assert admin_client.get(long_url).status_code == 302
+
+
+def test_object_action_bound_admin_state(admin_client, monkeypatch, test_model_instance):
+    from django.contrib import admin
+    model_admin = admin.site._registry[test_model_instance.__class__]
+    monkeypatch.setattr(model_admin, 'object_action_fragment_cache', True)
+    for name in ('_object_action_fragment_cache', '_object_actions_index', '_object_action_form_cache'):
+        monkeypatch.delitem(model_admin.__dict__, name, raising=False)
+    # The change view of a fresh ModelAdmin caches fragments on the ModelAdmin
+    # itself rather than on its request-bound copy.
+    response = admin_client.get(reverse('admin:test_app_testmodel_change', args=[test_model_instance.pk]))
+    assert response.status_code == 200
+    fragment_cache = model_admin.__dict__['_object_action_fragment_cache']
+    assert fragment_cache.entries
+    assert '_object_actions_index' in model_admin.__dict__
+
+
+@pytest.mark.django_db(databases=['default', 'other'])
+def test_object_action_bulk_using(admin_user, rf, monkeypatch, test_model):
+    from django.contrib import admin
+    model_admin = admin.site._registry[test_model]
+    admin_user.save(using='other')
+    objs = [test_model.objects.using('other').create(name='other{}'.format(n)) for n in range(2)]
+    bulk_messages = []
+    monkeypatch.setattr(model_admin, 'message_user', lambda request, msg, level: bulk_messages.append((level, msg)))
+    request = rf.post('/')
+    request.user = admin_user
+    model_admin.object_action_bulk_view(request, test_model.objects.using('other').all(), 'refresh')
+    assert bulk_messages == [(messages.SUCCESS, 'Successfully refreshed 2 test models.')]
+    assert test_model.objects.using('other').filter(refreshed__isnull=False).count() == 2
+    assert LogEntry.objects.using('other').count() == 2
+    # Objects missing from the database are reported as failures.
+    results = model_admin.execute_object_action_chunk(request, [objs[0].pk, objs[1].pk + 100], 'refresh', 'other')
+    assert [error for obj, error in results][0] is None
+    assert results[1][0] == objs[1].pk + 100
+    assert 'does not exist' in results[1][1]